@@ -0,0 +1,15 @@
+"""Chain topology order shared by the A2A protocol and compliance layers."""
+
+from types import MappingProxyType
+
+# Chain topology order and next-hop rule; static, so shared by every instance
+CHAIN_ORDER = ("planner", "coder", "runner", "critic", "summarizer")
+CHAIN_NEXT = MappingProxyType(
+    {
+        "planner": "coder",
+        "coder": "runner",
+        "runner": "critic",
+        "critic": "summarizer",
+        "summarizer": "planner",
+    }
+)
@@ -5,10 +5,11 @@ communication, enforcing topology rules and routing through the Router.
 """
 
 from typing import Optional
-from uuid import uuid4
 
+from apex.a2a.chain import CHAIN_NEXT, CHAIN_ORDER
 from apex.a2a.sdk_adapter import A2ACompliance
-from apex.runtime.message import Message
+from apex.runtime.errors import ChainViolationError, InvalidRecipientError, QueueFullError
+from apex.runtime.message import Message, next_msg_id
 from apex.runtime.router import Router
 from apex.runtime.switch import SwitchEngine
 
@@ -44,15 +45,9 @@ class A2AProtocol:
         self.planner_id = planner_id
         self.fanout_limit = fanout_limit
 
-        # Define chain topology order
-        self.chain_order = ["planner", "coder", "runner", "critic", "summarizer"]
-        self.chain_next = {
-            "planner": "coder",
-            "coder": "runner",
-            "runner": "critic",
-            "critic": "summarizer",
-            "summarizer": "planner",
-        }
+        # Chain topology order and next-hop rule (read-only, module-level)
+        self.chain_order = CHAIN_ORDER
+        self.chain_next = CHAIN_NEXT
 
         # Initialize compliance layer
         roles = ["planner", "coder", "runner", "critic", "summarizer"]
@@ -93,9 +88,7 @@ class A2AProtocol:
         # Allow test override, otherwise use active topology
         topology = force_topology if force_topology else active_topology
 
-        # Build message(s) based on active topology
-        messages = []
-
+        # Resolve recipient(s) based on active topology
         if topology == "star":
             # Star topology: requires single recipient (not recipients list)
             if not recipient:
@@ -106,28 +99,10 @@ class A2AProtocol:
             # Star topology: all non-planner communicate through planner
             if sender != self.planner_id and recipient != self.planner_id:
                 # Non-planner must route through planner
-                messages.append(
-                    Message(
-                        episode_id="a2a-episode",
-                        msg_id=f"msg-{uuid4().hex}",
-                        sender=sender,
-                        recipient=self.planner_id,
-                        topo_epoch=epoch,
-                        payload={"content": content},
-                    )
-                )
+                targets = [self.planner_id]
             else:
                 # Planner involved: direct send
-                messages.append(
-                    Message(
-                        episode_id="a2a-episode",
-                        msg_id=f"msg-{uuid4().hex}",
-                        sender=sender,
-                        recipient=recipient,
-                        topo_epoch=epoch,
-                        payload={"content": content},
-                    )
-                )
+                targets = [recipient]
 
         elif topology == "chain":
             # Chain topology: sequential processing with next-hop enforcement
@@ -137,21 +112,9 @@ class A2AProtocol:
             # Enforce next-hop semantics
             expected_next = self.chain_next.get(sender)
             if expected_next and recipient != expected_next:
-                raise ValueError(
-                    f"Chain topology violation: {sender} must send to "
-                    f"{expected_next}, not {recipient}"
-                )
-
-            messages.append(
-                Message(
-                    episode_id="a2a-episode",
-                    msg_id=f"msg-{uuid4().hex}",
-                    sender=sender,
-                    recipient=recipient,
-                    topo_epoch=epoch,
-                    payload={"content": content},
-                )
-            )
+                raise ChainViolationError(sender, expected_next, recipient)
+
+            targets = [recipient]
 
         elif topology == "flat":
             # Flat topology: limited broadcast
@@ -160,24 +123,25 @@ class A2AProtocol:
             if len(recipients) > self.fanout_limit:
                 raise ValueError(f"Recipients exceed fanout limit of {self.fanout_limit}")
 
-            for r in recipients:
-                messages.append(
-                    Message(
-                        episode_id="a2a-episode",
-                        msg_id=f"msg-{uuid4().hex}",
-                        sender=sender,
-                        recipient=r,
-                        topo_epoch=epoch,
-                        payload={"content": content},
-                    )
-                )
+            targets = recipients
 
         else:
             raise ValueError(f"Unknown topology: {topology}")
 
-        # Route messages through Router (never bypass!)
-        from apex.runtime.errors import InvalidRecipientError, QueueFullError
+        # Every message of this send carries the epoch read above
+        messages = [
+            Message(
+                episode_id="a2a-episode",
+                msg_id=next_msg_id(),
+                sender=sender,
+                recipient=r,
+                topo_epoch=epoch,
+                payload={"content": content},
+            )
+            for r in targets
+        ]
 
+        # Route messages through Router (never bypass!)
         envelopes = []
         for msg in messages:
             try:
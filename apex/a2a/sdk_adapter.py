@@ -7,9 +7,10 @@ All messages still route through our Router - no bypass allowed.
 
 import asyncio
 import os
-from uuid import uuid4
 
-from apex.runtime.message import Message
+from apex.a2a.chain import CHAIN_NEXT, CHAIN_ORDER
+from apex.runtime.errors import ChainViolationError
+from apex.runtime.message import Message, next_msg_id
 from apex.runtime.router import Router
 from apex.runtime.switch import SwitchEngine
 
@@ -84,19 +85,21 @@ class A2ACompliance:
         self.router = router
         self.switch = switch
         self.roles = roles
+        self._role_set = frozenset(roles)
         self.planner_id = planner_id
         self.fanout_limit = fanout_limit
         self.include_summarizer = include_summarizer
         self._ingress_task = None
 
-        # Chain topology order for next-hop enforcement
-        self.chain_order = ["planner", "coder", "runner", "critic", "summarizer"]
-        self.chain_next = {
-            "planner": "coder",
-            "coder": "runner",
-            "runner": "critic",
-            "critic": "summarizer",
-            "summarizer": "planner",
+        # Chain topology order and next-hop rule (read-only, module-level)
+        self.chain_order = CHAIN_ORDER
+        self.chain_next = CHAIN_NEXT
+
+        # Per-topology ingress handlers, bound once
+        self._topology_handlers = {
+            "star": self._star_messages,
+            "chain": self._chain_messages,
+            "flat": self._flat_messages,
         }
 
     def agent_card(self) -> dict:
@@ -211,131 +214,107 @@ class A2ACompliance:
         # Get active topology from switch (NEVER trust metadata!)
         topology, epoch = self.switch.active()
 
-        # Metadata is only informational, not for enforcement
-        metadata = params.get("metadata", {})
-        # Store what external claimed (for debugging) but don't use it
-        if "topology" in metadata:
-            metadata["claimed_topology"] = metadata["topology"]
-
-        # Apply topology rules and generate messages
-        messages = []
         sender = params.get("sender", "external")
         content = params.get("content", "")
-
-        # Preserve external request ID if present
         ext_request_id = params.get("id")
-        if ext_request_id and isinstance(params.get("metadata"), dict):
-            metadata["orig_request_id"] = ext_request_id
-
-        if topology == "star":
-            # All non-planner agents communicate through planner
-            if sender != self.planner_id:
-                # Route to planner first
-                messages.append(
-                    Message(
-                        episode_id=f"a2a-{metadata.get('episode', 'default')}",
-                        msg_id=f"msg-{uuid4().hex}",
-                        sender=sender,
-                        recipient=self.planner_id,
-                        topo_epoch=epoch,
-                        payload=(
-                            {"content": content, "ext_request_id": ext_request_id}
-                            if ext_request_id
-                            else {"content": content}
-                        ),
-                    )
-                )
-            else:
-                # Planner can send to any agent
-                recipient = params.get("recipient")
-                if recipient:
-                    messages.append(
-                        Message(
-                            episode_id=f"a2a-{metadata.get('episode', 'default')}",
-                            msg_id=f"msg-{uuid4().hex}",
-                            sender=sender,
-                            recipient=recipient,
-                            topo_epoch=epoch,
-                            payload=(
-                                {"content": content, "ext_request_id": ext_request_id}
-                                if ext_request_id
-                                else {"content": content}
-                            ),
-                        )
-                    )
-
-        elif topology == "chain":
-            # Sequential processing through roles with next-hop enforcement
-            recipient = params.get("recipient")
-
-            # External senders must enter through planner
-            if sender not in self.roles:
-                if recipient != "planner":
-                    raise ValueError(
-                        f"External chain ingress must route through planner, not {recipient}"
-                    )
-                messages.append(
-                    Message(
-                        episode_id=f"a2a-{metadata.get('episode', 'default')}",
-                        msg_id=f"msg-{uuid4().hex}",
-                        sender=sender,
-                        recipient="planner",
-                        topo_epoch=epoch,
-                        payload=(
-                            {"content": content, "ext_request_id": ext_request_id}
-                            if ext_request_id
-                            else {"content": content}
-                        ),
-                    )
-                )
-            else:
-                # Internal senders must follow chain next-hop
-                expected_next = self.chain_next.get(sender)
-                if expected_next and recipient != expected_next:
-                    raise ValueError(
-                        f"Chain topology violation: {sender} must send to "
-                        f"{expected_next}, not {recipient}"
-                    )
-                messages.append(
-                    Message(
-                        episode_id=f"a2a-{metadata.get('episode', 'default')}",
-                        msg_id=f"msg-{uuid4().hex}",
-                        sender=sender,
-                        recipient=recipient,
-                        topo_epoch=epoch,
-                        payload=(
-                            {"content": content, "ext_request_id": ext_request_id}
-                            if ext_request_id
-                            else {"content": content}
-                        ),
-                    )
-                )
-
-        elif topology == "flat":
-            # Limited broadcast up to fanout_limit
-            recipients = params.get("recipients", [])
-            if len(recipients) > self.fanout_limit:
-                raise ValueError(f"Fanout exceeds limit of {self.fanout_limit}")
-            for recipient in recipients[: self.fanout_limit]:
-                messages.append(
-                    Message(
-                        episode_id=f"a2a-{metadata.get('episode', 'default')}",
-                        msg_id=f"msg-{uuid4().hex}",  # Unique ID per recipient
-                        sender=sender,
-                        recipient=recipient,
-                        topo_epoch=epoch,
-                        payload=(
-                            {"content": content, "ext_request_id": ext_request_id}
-                            if ext_request_id
-                            else {"content": content}
-                        ),
-                    )
-                )
 
+        # Metadata is only informational, not for enforcement
+        metadata = params.get("metadata")
+        if metadata is None:
+            episode_id = "a2a-default"
         else:
+            # Store what external claimed (for debugging) but don't use it
+            if "topology" in metadata:
+                metadata["claimed_topology"] = metadata["topology"]
+            # Preserve external request ID if present
+            if ext_request_id and isinstance(metadata, dict):
+                metadata["orig_request_id"] = ext_request_id
+            episode_id = f"a2a-{metadata.get('episode', 'default')}"
+
+        handler = self._topology_handlers.get(topology)
+        if handler is None:
             raise ValueError(f"Unknown topology: {topology}")
 
-        return messages
+        return handler(params, episode_id, sender, content, ext_request_id, epoch)
+
+    @staticmethod
+    def _ingress_message(episode_id, sender, recipient, content, ext_request_id, epoch) -> Message:
+        """Build one ingress Message with a fresh msg_id."""
+        return Message(
+            episode_id=episode_id,
+            msg_id=next_msg_id(),
+            sender=sender,
+            recipient=recipient,
+            topo_epoch=epoch,
+            payload=(
+                {"content": content, "ext_request_id": ext_request_id}
+                if ext_request_id
+                else {"content": content}
+            ),
+        )
+
+    def _star_messages(self, params, episode_id, sender, content, ext_request_id, epoch):
+        # All non-planner agents communicate through planner
+        if sender != self.planner_id:
+            # Route to planner first
+            return [
+                self._ingress_message(
+                    episode_id, sender, self.planner_id, content, ext_request_id, epoch
+                )
+            ]
+
+        # Planner can send to any agent
+        recipient = params.get("recipient")
+        if recipient:
+            return [
+                self._ingress_message(episode_id, sender, recipient, content, ext_request_id, epoch)
+            ]
+        return []
+
+    def _chain_messages(self, params, episode_id, sender, content, ext_request_id, epoch):
+        # Sequential processing through roles with next-hop enforcement
+        recipient = params.get("recipient")
+
+        # External senders must enter through planner
+        if sender not in self._role_set:
+            if recipient != "planner":
+                raise ValueError(
+                    f"External chain ingress must route through planner, not {recipient}"
+                )
+            return [
+                self._ingress_message(episode_id, sender, "planner", content, ext_request_id, epoch)
+            ]
+
+        # Internal senders must follow chain next-hop
+        expected_next = self.chain_next.get(sender)
+        if expected_next and recipient != expected_next:
+            raise ChainViolationError(sender, expected_next, recipient)
+        return [
+            self._ingress_message(episode_id, sender, recipient, content, ext_request_id, epoch)
+        ]
+
+    def _flat_messages(self, params, episode_id, sender, content, ext_request_id, epoch):
+        # Limited broadcast up to fanout_limit
+        recipients = params.get("recipients", [])
+        if len(recipients) > self.fanout_limit:
+            raise ValueError(f"Fanout exceeds limit of {self.fanout_limit}")
+        # Build the payload once; each message gets its own shallow copy
+        payload = (
+            {"content": content, "ext_request_id": ext_request_id}
+            if ext_request_id
+            else {"content": content}
+        )
+        return [
+            Message(
+                episode_id=episode_id,
+                msg_id=next_msg_id(),  # Unique ID per recipient
+                sender=sender,
+                recipient=recipient,
+                topo_epoch=epoch,
+                payload=payload.copy(),
+            )
+            for recipient in recipients[: self.fanout_limit]
+        ]
 
     async def ingress_http(self, host: str = "127.0.0.1", port: int = 10001):
         """Start A2A HTTP ingress server.
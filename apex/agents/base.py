@@ -2,12 +2,11 @@ from __future__ import annotations
 
 import time
 from typing import Optional
-from uuid import uuid4
 
 from apex.integrations.llm.client_api import LLM
 from apex.integrations.mcp.fs_api import FS
 from apex.integrations.mcp.test_api import Test
-from apex.runtime.message import AgentID, Message
+from apex.runtime.message import AgentID, Message, next_msg_id
 from apex.runtime.router_api import IRouter
 from apex.runtime.switch_api import ISwitchEngine
 
@@ -55,7 +54,7 @@ class BaseAgent:
         topology, epoch = self.switch.active()
         return Message(
             episode_id=self.episode_id,
-            msg_id=uuid4().hex,
+            msg_id=next_msg_id(),
             sender=self.agent_id,
             recipient=recipient,
             topo_epoch=epoch,
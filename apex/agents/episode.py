@@ -4,7 +4,7 @@ import time
 from typing import Dict
 from uuid import uuid4
 
-from apex.runtime.message import AgentID, Message
+from apex.runtime.message import AgentID, Message, next_msg_id
 from apex.runtime.router_api import IRouter
 from apex.runtime.switch_api import ISwitchEngine
 
@@ -50,7 +50,7 @@ class EpisodeRunner:
         _, epoch = self.switch.active()
         kickoff = Message(
             episode_id=self.episode_id,
-            msg_id=uuid4().hex,
+            msg_id=next_msg_id(),
             sender=AgentID("system"),
             recipient=AgentID("planner"),
             topo_epoch=epoch,
@@ -90,21 +90,10 @@ class EpisodeRunner:
                     await self.router.route(ret_msg)
                     messages_routed += 1
 
-            # If no messages were processed in this step, check if we're done
+            # Every agent was polled and nothing was routed since, so an empty
+            # step means all queues are drained and the episode is complete
             if messages_in_step == 0:
-                # Check if there are any pending messages
-                all_done = True
-                for agent_id in self.agents:
-                    check_msg = await self.router.dequeue(agent_id)
-                    if check_msg is not None:
-                        # Put it back by re-routing it
-                        await self.router.route(check_msg)
-                        all_done = False
-                        break
-
-                if all_done:
-                    # Episode complete
-                    break
+                break
 
         return {
             "topology": topology,
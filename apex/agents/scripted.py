@@ -7,12 +7,11 @@ import asyncio
 import json
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
-from uuid import uuid4
 
 from ..llm.client import LLMClient
 from ..mcp.fs import FSConfig, MCPFileSystem
 from ..mcp.test import MCPTestRunner, TestConfig
-from ..runtime.message import AgentID, Message
+from ..runtime.message import AgentID, Message, next_msg_id
 from ..runtime.router import Router
 from ..topology.semantics import TopologySemantics
 
@@ -142,7 +141,7 @@ class ScriptedAgent:
 
             response_msg = Message(
                 episode_id=original_msg.episode_id,
-                msg_id=uuid4().hex,
+                msg_id=next_msg_id(),
                 sender=self.config.agent_id,
                 recipient=recipient,
                 topo_epoch=original_msg.topo_epoch,  # Use same epoch
@@ -62,7 +62,7 @@ class APEXController:
         """
         import time
 
-        tick_start = time.monotonic_ns()
+        tick_start = time.perf_counter_ns()
 
         self.step_count += 1
 
@@ -116,7 +116,7 @@ class APEXController:
                 record["switch"]["error"] = str(e)
 
         # Measure full tick latency
-        tick_end = time.monotonic_ns()
+        tick_end = time.perf_counter_ns()
         record["tick_ms"] = (tick_end - tick_start) / 1_000_000
 
         # Log decision
@@ -106,6 +106,10 @@ class EvalHarness:
             self.provider = SWELiteProvider(cache_dir=str(cache_dir))
             self.work_root = Path(tempfile.mkdtemp(prefix="apex_swe_"))
 
+    def reset_rng(self) -> None:
+        """Reseed the episode RNG so the next run starts from the initial seed."""
+        self.rng = random.Random(self.seed)
+
     def load_tasks(self, n_episodes: Optional[int] = None) -> List[Task]:
         """Load tasks based on mode."""
         if self.mode == "stub":
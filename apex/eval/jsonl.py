@@ -0,0 +1,83 @@
+"""Reading and output helpers for JSONL task lists and result files."""
+
+from __future__ import annotations
+
+import io
+import mmap
+import os
+from pathlib import Path
+from typing import IO, Iterator, Tuple
+
+# Guard import for optional zstandard (needed only for .jsonl.zst files)
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    HAS_ZSTD = False
+
+# Files at least this large are memory-mapped; smaller ones use plain buffered reads
+MMAP_THRESHOLD = 1 << 20
+
+
+def require_zstd(path: Path) -> None:
+    """Raise RuntimeError if ``path`` is a ``.zst`` file and zstandard is missing."""
+    if Path(path).suffix == ".zst" and not HAS_ZSTD:
+        raise RuntimeError(f"zstandard is required for {path} (pip install zstandard)")
+
+
+def open_jsonl(path: Path) -> IO[bytes]:
+    """Open a JSONL file for binary reading, decompressing ``.zst`` transparently."""
+    require_zstd(path)
+    if Path(path).suffix == ".zst":
+        raw = open(path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.BufferedReader(reader)
+    return open(path, "rb")
+
+
+def open_jsonl_writer(path: Path) -> IO[bytes]:
+    """Open a JSONL file for binary writing, compressing ``.zst`` transparently."""
+    require_zstd(path)
+    if Path(path).suffix == ".zst":
+        raw = open(path, "wb")
+        compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+        return compressor.stream_writer(raw, closefd=True)
+    return open(path, "wb")
+
+
+def iter_lines(path: Path) -> Iterator[Tuple[int, bytes]]:
+    """Yield (line_num, line) for every line, with the trailing newline removed.
+
+    Both ``\\n`` and ``\\r\\n`` endings are stripped, so CRLF files read the
+    same as text-mode iteration. Blank lines are yielded as ``b""``.
+
+    Large uncompressed files are memory-mapped and split with ``mm.readline``
+    so reads come straight from the page cache instead of many small
+    ``read()`` calls; small and ``.zst`` files use the ordinary file iterator.
+    """
+    if Path(path).suffix != ".zst" and os.path.getsize(path) >= MMAP_THRESHOLD:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line_num, line in enumerate(iter(mm.readline, b""), 1):
+                yield line_num, line.rstrip(b"\r\n")
+        return
+
+    with open_jsonl(path) as f:
+        for line_num, line in enumerate(f, 1):
+            yield line_num, line.rstrip(b"\r\n")
+
+
+def is_writable(path: Path) -> bool:
+    """Return whether ``path`` could be written, without creating anything.
+
+    An existing file must be writable; otherwise the nearest existing
+    ancestor must be a directory we can create entries in.
+    """
+    path = Path(path).resolve()
+    if path.exists():
+        return path.is_file() and os.access(path, os.W_OK)
+    parent = path.parent
+    while not parent.exists():
+        parent = parent.parent
+    return parent.is_dir() and os.access(parent, os.W_OK | os.X_OK)
@@ -16,7 +16,7 @@ from .coord.coordinator import CoordConfig, Coordinator
 from .llm.client import LLMClient, LLMConfig, TokenTracker
 from .mcp.fs import FSConfig, MCPFileSystem
 from .mcp.test import MCPTestRunner, TestConfig
-from .runtime.message import AgentID, Message
+from .runtime.message import AgentID, Message, next_msg_id
 from .runtime.router import Router
 from .runtime.switch import SwitchEngine
 from .topology.semantics import PhaseHeuristics, create_topology
@@ -141,7 +141,7 @@ class APEXHarness:
         # Create initial task message
         task_msg = Message(
             episode_id=episode_id,
-            msg_id=uuid4().hex,
+            msg_id=next_msg_id(),
             sender=AgentID("harness"),
             recipient=AgentID("manager"),
             topo_epoch=self.router.active_epoch(),
@@ -12,3 +12,22 @@ class InvalidRecipientError(Exception):
 
 class QueueFullError(Exception):
     pass
+
+
+class ChainViolationError(ValueError):
+    """A chain-topology send that skips the sender's next hop.
+
+    The message is formatted only when the error is rendered.
+    """
+
+    def __init__(self, sender, expected, actual):
+        super().__init__(sender, expected, actual)
+        self.sender = sender
+        self.expected = expected
+        self.actual = actual
+
+    def __str__(self):
+        return (
+            f"Chain topology violation: {self.sender} must send to "
+            f"{self.expected}, not {self.actual}"
+        )
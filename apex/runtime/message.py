@@ -4,7 +4,10 @@ This module defines the core Message type used throughout the APEX runtime,
 including retry fields and epoch tracking for topology switching.
 """
 
+import itertools
 import json
+import os
+import secrets
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, Literal, NewType, Optional, Union
@@ -16,8 +19,29 @@ Epoch = NewType("Epoch", int)
 # Size limit for message payload (512 KB)
 _MAX_PAYLOAD_BYTES = 512 * 1024
 
+# msg_ids are a random per-process prefix plus a counter: the same 32 hex
+# chars as uuid4().hex, without reading urandom for every message
+_msg_id_prefix = secrets.token_hex(8)
+_msg_id_counter = itertools.count()
 
-@dataclass  # Mutable for retry fields
+
+def _reseed_msg_ids() -> None:
+    """Give a forked child its own prefix so it cannot repeat the parent's ids."""
+    global _msg_id_prefix, _msg_id_counter
+    _msg_id_prefix = secrets.token_hex(8)
+    _msg_id_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_msg_ids)
+
+
+def next_msg_id() -> str:
+    """Return a process-unique msg_id: ``msg-`` followed by 32 lowercase hex chars."""
+    return f"msg-{_msg_id_prefix}{next(_msg_id_counter):016x}"
+
+
+@dataclass(slots=True)  # Mutable for retry fields; slots drop the per-instance __dict__
 class Message:
     """Core message type for agent communication.
 
@@ -36,6 +36,11 @@ class TopologyGuard:
     CHAIN_ORDER_WITH_SUMMARIZER = [PLANNER, CODER, RUNNER, CRITIC, SUMMARIZER, PLANNER]
     CHAIN_ORDER_WITHOUT_SUMMARIZER = [PLANNER, CODER, RUNNER, CRITIC, PLANNER]
 
+    # Allowed (sender, recipient) hops under either chain order
+    CHAIN_PAIRS = frozenset(
+        zip(CHAIN_ORDER_WITH_SUMMARIZER, CHAIN_ORDER_WITH_SUMMARIZER[1:])
+    ) | frozenset(zip(CHAIN_ORDER_WITHOUT_SUMMARIZER, CHAIN_ORDER_WITHOUT_SUMMARIZER[1:]))
+
     def __init__(self, fanout_limit: int = 2):
         self.fanout_limit = fanout_limit
         self._broadcast_count = 0  # Track broadcast fanout for flat topology
@@ -100,21 +105,8 @@ class TopologyGuard:
         - Strict pipeline: Planner → Coder → Runner → Critic → (Summarizer) → Planner
         - Disallow any other pair
         """
-        # Check both chain orders (with and without summarizer)
-        valid_pairs_with_summarizer = set()
-        for i in range(len(self.CHAIN_ORDER_WITH_SUMMARIZER) - 1):
-            valid_pairs_with_summarizer.add(
-                (self.CHAIN_ORDER_WITH_SUMMARIZER[i], self.CHAIN_ORDER_WITH_SUMMARIZER[i + 1])
-            )
-
-        valid_pairs_without_summarizer = set()
-        for i in range(len(self.CHAIN_ORDER_WITHOUT_SUMMARIZER) - 1):
-            valid_pairs_without_summarizer.add(
-                (self.CHAIN_ORDER_WITHOUT_SUMMARIZER[i], self.CHAIN_ORDER_WITHOUT_SUMMARIZER[i + 1])
-            )
-
         pair = (str(sender), str(recipient))
-        if pair not in valid_pairs_with_summarizer and pair not in valid_pairs_without_summarizer:
+        if pair not in self.CHAIN_PAIRS:
             raise TopologyViolationError(
                 f"Chain topology violation: {sender} → {recipient} " f"(not in allowed chain order)"
             )
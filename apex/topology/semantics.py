@@ -3,8 +3,9 @@
 Defines routing rules and phase heuristics for each topology.
 """
 
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Set
+from typing import Deque, List, Set
 
 from ..runtime.message import AgentID, Message
 
@@ -189,7 +190,7 @@ class PhaseHeuristics:
             window_size: Size of sliding window
         """
         self.window_size = window_size
-        self.message_history: List[Message] = []
+        self.message_history: Deque[Message] = deque(maxlen=window_size)
 
     def observe_message(self, msg: Message):
         """Add message to history.
@@ -197,10 +198,8 @@ class PhaseHeuristics:
         Args:
             msg: Message to observe
         """
+        # Bounded deque drops the oldest message once K are held
         self.message_history.append(msg)
-        # Keep only last K messages
-        if len(self.message_history) > self.window_size:
-            self.message_history.pop(0)
 
     def infer_phase(self) -> str:
         """Infer current phase from message history.
@@ -212,8 +211,9 @@ class PhaseHeuristics:
             return PHASE_PLANNING
 
         # Simple heuristics based on message patterns
-        recent_agents = [msg.sender for msg in self.message_history[-3:]]
-        recent_recipients = [msg.recipient for msg in self.message_history[-3:]]
+        recent = list(self.message_history)[-3:]
+        recent_agents = [msg.sender for msg in recent]
+        recent_recipients = [msg.recipient for msg in recent]
 
         # If manager is sending to multiple workers, likely planning
         manager_sends = sum(1 for a in recent_agents if "manager" in str(a))
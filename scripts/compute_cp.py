@@ -7,7 +7,7 @@ import argparse
 import json
 import math
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 def load_jsonl(path: str) -> List[Dict]:
@@ -93,64 +93,76 @@ def clopper_pearson_upper(violations: int, total: int, confidence: float = 0.95)
     return beta_inv(confidence, violations + 1, total - violations)
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Compute Clopper-Pearson bound for budget violations")
-    parser.add_argument("--in", dest="input", type=str, required=True, help="Input JSONL file")
-    parser.add_argument("--out", type=str, required=True, help="Output JSON file")
-    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level (default 0.95)")
-    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducibility")
-    parser.add_argument("--source", type=str, default=None, help="Source type: 'real' or 'mock'")
-    parser.add_argument("--verbose", action="store_true", help="Print detailed stats")
-    
-    args = parser.parse_args()
-    
-    # Load results
-    results = load_jsonl(args.input)
-    
-    # Filter out metadata
+def cp_report(
+    results: List[Dict],
+    input_file: str,
+    confidence: float = 0.95,
+    seed: int = 42,
+    source: Optional[str] = None,
+) -> Optional[Dict]:
+    """Build the CP output record that the CLI writes to ``--out``.
+
+    Metadata lines are ignored. Returns None when there are no results.
+    """
     results = [r for r in results if "__meta__" not in r]
-    
     if not results:
-        print("Error: No results found in input file")
-        return
+        return None
     
     # Count violations (handle both field names)
     total = len(results)
     violations = sum(1 for r in results if r.get("budget_violated", r.get("over_budget", False)))
     
     # Compute CP upper bound
-    cp_upper = clopper_pearson_upper(violations, total, args.confidence)
+    cp_upper = clopper_pearson_upper(violations, total, confidence)
     
     # Detect source from content
     # Use explicit source if provided
-    if args.source:
-        source = args.source
-    else:
+    if not source:
         # Default to mock for F5.5 artifacts
         source = "mock"
         
         # Check first result to detect if mock
-        if results:
-            first_result = results[0]
-            # Mock results have notes field with topology info
-            if "notes" in first_result and ("final_topology" in first_result.get("notes", "") or 
-                                           "best_topology" in first_result.get("notes", "")):
-                source = "mock"
-            # Real SWE results would have different structure
-            elif "swe_record" in first_result.get("metadata", {}):
-                source = "swe_real"
-    
-    # Prepare output
-    output = {
+        first_result = results[0]
+        # Mock results have notes field with topology info
+        if "notes" in first_result and ("final_topology" in first_result.get("notes", "") or 
+                                       "best_topology" in first_result.get("notes", "")):
+            source = "mock"
+        # Real SWE results would have different structure
+        elif "swe_record" in first_result.get("metadata", {}):
+            source = "swe_real"
+    
+    return {
         "violations": violations,
         "total": total,
         "cp_upper_95": cp_upper,
-        "seed": args.seed,
-        "confidence": args.confidence,
+        "seed": seed,
+        "confidence": confidence,
         "empirical_rate": violations / total if total > 0 else 0.0,
         "source": source,
-        "input_file": str(args.input)
+        "input_file": str(input_file)
     }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute Clopper-Pearson bound for budget violations")
+    parser.add_argument("--in", dest="input", type=str, required=True, help="Input JSONL file")
+    parser.add_argument("--out", type=str, required=True, help="Output JSON file")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level (default 0.95)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducibility")
+    parser.add_argument("--source", type=str, default=None, help="Source type: 'real' or 'mock'")
+    parser.add_argument("--verbose", action="store_true", help="Print detailed stats")
+    
+    args = parser.parse_args()
+    
+    # Load results
+    results = [r for r in load_jsonl(args.input) if "__meta__" not in r]
+    output = cp_report(results, args.input, args.confidence, args.seed, args.source)
+    if output is None:
+        print("Error: No results found in input file")
+        return
+    total = output["total"]
+    violations = output["violations"]
+    cp_upper = output["cp_upper_95"]
     
     # Write output
     output_path = Path(args.out)
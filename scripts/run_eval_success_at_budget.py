@@ -14,19 +14,82 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from apex.controller.bandit_v1 import BanditSwitchV1
 from apex.eval.harness import EvalHarness
+from apex.eval.jsonl import is_writable, iter_lines
 from apex.eval.stubs.topology_switch import TopologySwitch
 
+POLICIES = ["static_star", "static_chain", "static_flat", "bandit_v1"]
+
+
+def run_policy(policy, tasks, harness, budget, seed, output_path):
+    """Run every task under one policy and write its JSONL results.
+
+    The harness and task list are shared across policies; the harness RNG is
+    reseeded and the bandit and switch are rebuilt per call, so each policy's
+    results match a standalone run of that policy.
+    """
+    harness.reset_rng()
+
+    # Setup switch and bandit for dynamic policy
+    switch = None
+    bandit = None
+    if policy == "bandit_v1":
+        switch = TopologySwitch(initial="star", seed=seed)
+        bandit = BanditSwitchV1(d=8, seed=seed)
+
+    # Run episodes and collect results
+    results = []
+    for task in tasks:
+        result = harness.run_episode(
+            task=task,
+            policy=policy,
+            budget=budget,
+            switch=switch,
+            bandit=bandit
+        )
+        results.append(result)
+
+    # Write JSONL output (directory was prepared up front in main)
+    with open(output_path, "w") as f:
+        for result in results:
+            json.dump(result.to_dict(), f)
+            f.write("\n")
+
+    # Print summary stats
+    total = len(results)
+    successes = sum(1 for r in results if r.success)
+    over_budget = sum(1 for r in results if r.over_budget)
+    avg_tokens = sum(r.tokens_used for r in results) / total if total > 0 else 0
+
+    print(f"Policy: {policy}")
+    print(f"Episodes: {total}")
+    print(f"Successes: {successes}/{total} ({100*successes/total:.1f}%)")
+    print(f"Over budget: {over_budget}/{total} ({100*over_budget/total:.1f}%)")
+    print(f"Avg tokens: {avg_tokens:.0f}")
+
+    if policy == "bandit_v1":
+        total_switches = sum(r.epoch_switches for r in results)
+        print(f"Total epoch switches: {total_switches}")
+
+    print(f"Output written to: {output_path}")
+    return results
+
 
 def main():
     parser = argparse.ArgumentParser(description="Run Success@Budget evaluation")
     parser.add_argument("--episodes", type=int, default=12, help="Number of episodes")
     parser.add_argument("--budget", type=int, default=10000, help="Token budget per episode")
-    parser.add_argument(
+    policy_group = parser.add_mutually_exclusive_group(required=True)
+    policy_group.add_argument(
         "--policy",
-        choices=["static_star", "static_chain", "static_flat", "bandit_v1"],
-        required=True,
+        choices=POLICIES,
         help="Policy to evaluate"
     )
+    policy_group.add_argument(
+        "--policies",
+        type=str,
+        help="Comma-separated policies to evaluate with one shared harness "
+        "(--out may contain '{policy}')"
+    )
     parser.add_argument("--out", type=str, required=True, help="Output JSONL file")
     parser.add_argument("--seed", type=int, default=42, help="Random seed")
     
@@ -69,6 +132,26 @@ def main():
     )
     
     args = parser.parse_args()
+
+    if args.policies:
+        policies = [p.strip() for p in args.policies.split(",") if p.strip()]
+        unknown = [p for p in policies if p not in POLICIES]
+        if unknown:
+            parser.error(f"unknown policies: {', '.join(unknown)} (choose from {POLICIES})")
+        if len(policies) > 1 and "{policy}" not in args.out:
+            parser.error("--out must contain '{policy}' when running multiple policies")
+    else:
+        policies = [args.policy]
+
+    # Resolve and check every output path now so an unwritable location fails
+    # immediately instead of after all episodes have run. Nothing is created
+    # until the checks pass, so an aborted run leaves no empty files behind.
+    output_paths = {}
+    for policy in policies:
+        output_path = Path(args.out.replace("{policy}", policy)).resolve()
+        if not is_writable(output_path):
+            parser.error(f"cannot write output file: {output_path}")
+        output_paths[policy] = output_path
     
     # Network gating check for SWE mode
     if args.mode == "swe" and not args.offline:
@@ -76,17 +159,18 @@ def main():
             print("Error: SWE mode requires network access.")
             print("Either set APEX_ALLOW_NETWORK=1 or use --offline with fixtures.")
             sys.exit(1)
+
+    for parent in {p.parent for p in output_paths.values()}:
+        parent.mkdir(parents=True, exist_ok=True)
     
     # Load task list if provided
     task_list = None
     if args.task_list:
         task_list = []
-        with open(args.task_list, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    entry = json.loads(line)
-                    task_list.append(entry["task_id"])
+        for _, line in iter_lines(args.task_list):
+            if line.strip():
+                entry = json.loads(line)
+                task_list.append(entry["task_id"])
         print(f"Loaded task list with {len(task_list)} tasks from {args.task_list}")
     
     # Initialize harness
@@ -107,51 +191,16 @@ def main():
     else:
         tasks = harness.load_tasks(n_episodes=args.episodes)
     
-    # Setup switch and bandit for dynamic policy
-    switch = None
-    bandit = None
-    if args.policy == "bandit_v1":
-        switch = TopologySwitch(initial="star", seed=args.seed)
-        bandit = BanditSwitchV1(d=8, seed=args.seed)
-    
-    # Run episodes and collect results
-    results = []
-    for task in tasks:
-        result = harness.run_episode(
-            task=task,
-            policy=args.policy,
+    # Harness and tasks are shared; each policy writes its own output file
+    for policy in policies:
+        run_policy(
+            policy,
+            tasks,
+            harness,
             budget=args.budget,
-            switch=switch,
-            bandit=bandit
+            seed=args.seed,
+            output_path=output_paths[policy],
         )
-        results.append(result)
-    
-    # Write JSONL output
-    output_path = Path(args.out)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_path, "w") as f:
-        for result in results:
-            json.dump(result.to_dict(), f)
-            f.write("\n")
-    
-    # Print summary stats
-    total = len(results)
-    successes = sum(1 for r in results if r.success)
-    over_budget = sum(1 for r in results if r.over_budget)
-    avg_tokens = sum(r.tokens_used for r in results) / total if total > 0 else 0
-    
-    print(f"Policy: {args.policy}")
-    print(f"Episodes: {total}")
-    print(f"Successes: {successes}/{total} ({100*successes/total:.1f}%)")
-    print(f"Over budget: {over_budget}/{total} ({100*over_budget/total:.1f}%)")
-    print(f"Avg tokens: {avg_tokens:.0f}")
-    
-    if args.policy == "bandit_v1":
-        total_switches = sum(r.epoch_switches for r in results)
-        print(f"Total epoch switches: {total_switches}")
-    
-    print(f"Output written to: {output_path}")
     
     # Clean up SWE workspace if used
     if args.mode == "swe":
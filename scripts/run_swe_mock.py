@@ -3,46 +3,55 @@
 
 import json
 import random
+import sys
+import types
 from pathlib import Path
 
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from apex.eval.jsonl import is_writable, iter_lines, open_jsonl_writer, require_zstd
+
+# Base success rates by policy (from historical data)
+_BASE_RATES = types.MappingProxyType({
+    "static_star": 0.565,   # 56.5%
+    "static_chain": 0.565,  # 56.5%
+    "static_flat": 0.652,   # 65.2%
+    "bandit_v1": 0.696,     # 69.6% (APEX)
+})
+
+# Token usage patterns
+_TOKEN_PATTERNS = types.MappingProxyType({
+    "static_star": (7557, 2000),   # mean, std
+    "static_chain": (7417, 2000),
+    "static_flat": (7312, 1800),
+    "bandit_v1": (4184, 1500),     # APEX uses fewer tokens
+})
+
+# Budget violation rates
+_VIOLATION_RATES = types.MappingProxyType({
+    "static_star": 0.261,   # 26.1%
+    "static_chain": 0.261,
+    "static_flat": 0.043,   # 4.3%
+    "bandit_v1": 0.0,       # 0% for APEX
+})
+
+_TOPOLOGY_PREFS = ("star", "chain", "flat")
+
 def simulate_swe_episode(task_id: str, policy: str, budget: int, seed: int, source: str = "mock") -> dict:
     """Simulate a SWE episode with realistic results."""
     rng = random.Random(seed + hash(task_id) + hash(policy))
     
-    # Base success rates by policy (from historical data)
-    base_rates = {
-        "static_star": 0.565,   # 56.5%
-        "static_chain": 0.565,  # 56.5%
-        "static_flat": 0.652,   # 65.2%
-        "bandit_v1": 0.696,     # 69.6% (APEX)
-    }
-    
-    # Token usage patterns
-    token_patterns = {
-        "static_star": (7557, 2000),   # mean, std
-        "static_chain": (7417, 2000),
-        "static_flat": (7312, 1800),
-        "bandit_v1": (4184, 1500),     # APEX uses fewer tokens
-    }
-    
-    # Budget violation rates
-    violation_rates = {
-        "static_star": 0.261,   # 26.1%
-        "static_chain": 0.261,
-        "static_flat": 0.043,   # 4.3%
-        "bandit_v1": 0.0,       # 0% for APEX
-    }
-    
     # Determine base success
-    success_prob = base_rates.get(policy, 0.5)
+    success_prob = _BASE_RATES.get(policy, 0.5)
     base_success = rng.random() < success_prob
     
     # Generate token usage
-    mean_tokens, std_tokens = token_patterns.get(policy, (7000, 2000))
+    mean_tokens, std_tokens = _TOKEN_PATTERNS.get(policy, (7000, 2000))
     tokens_used = max(100, int(rng.gauss(mean_tokens, std_tokens)))
     
     # Apply budget violation
-    violation_prob = violation_rates.get(policy, 0.1)
+    violation_prob = _VIOLATION_RATES.get(policy, 0.1)
     if rng.random() < violation_prob:
         tokens_used = int(budget * rng.uniform(1.01, 1.3))  # Over budget
     
@@ -56,14 +65,13 @@ def simulate_swe_episode(task_id: str, policy: str, budget: int, seed: int, sour
         epoch_switches = rng.randint(2, 5)  # Dynamic switches 2-5 times
     
     # Topology preference note
-    topology_prefs = ["star", "chain", "flat"]
     notes = ""
     if policy == "static_best":
         # Best static picks optimal per task
-        best_topo = rng.choice(topology_prefs)
+        best_topo = rng.choice(_TOPOLOGY_PREFS)
         notes = f"best_topology={best_topo}"
     elif policy == "bandit_v1":
-        final_topo = rng.choice(topology_prefs)
+        final_topo = rng.choice(_TOPOLOGY_PREFS)
         notes = f"final_topology={final_topo}"
     
     return {
@@ -84,29 +92,47 @@ def simulate_swe_episode(task_id: str, policy: str, budget: int, seed: int, sour
         }
     }
 
-def main():
-    """Run mock evaluation with task list."""
+def _build_parser():
+    """Build the CLI argument parser."""
     import argparse
-    
+
     parser = argparse.ArgumentParser()
     parser.add_argument("--policy", required=True, help="Policy to evaluate")
     parser.add_argument("--task-list", required=True, help="Task list JSONL")
     parser.add_argument("--budget", type=int, default=10000, help="Token budget")
-    parser.add_argument("--out", required=True, help="Output JSONL")
+    parser.add_argument(
+        "--out", required=True, help="Output JSONL (a .zst suffix writes a zstd-compressed stream)"
+    )
     parser.add_argument("--seed", type=int, default=42, help="Random seed")
     parser.add_argument("--source", default="mock", help="Source type (mock or real)")
-    
-    args = parser.parse_args()
+    return parser
+
+def main():
+    """Run mock evaluation with task list."""
+    args = _build_parser().parse_args()
+
+    # Check the output path up front so an unwritable location or missing
+    # zstandard fails before any episodes run, without creating the file
+    output_path = Path(args.out).resolve()
+    try:
+        require_zstd(output_path)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        return 1
+    if not is_writable(output_path):
+        print(f"Error: cannot write output file: {output_path}")
+        return 1
     
     # Load task list
     task_list = []
-    with open(args.task_list, "r") as f:
-        for line in f:
-            obj = json.loads(line)
-            # Skip metadata lines
-            if "__meta__" in obj:
-                continue
-            task_list.append(obj["task_id"])
+    for _, line in iter_lines(args.task_list):
+        if not line:
+            continue
+        obj = json.loads(line)
+        # Skip metadata lines
+        if "__meta__" in obj:
+            continue
+        task_list.append(obj["task_id"])
     
     print(f"Loaded {len(task_list)} tasks")
     print(f"Policy: {args.policy}")
@@ -134,31 +160,27 @@ def main():
             print(f"  Processed {i+1}/{len(task_list)} tasks...")
     
     # Write results
-    output_path = Path(args.out)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_path, "w") as f:
-        # Write metadata first
-        metadata = {
-            "__meta__": {
-                "source": args.source,
-                "generator": "run_swe_mock.py",
-                "split": "test",
-                "dataset": "SWE-bench/SWE-bench_Lite",
-                "task_list": args.task_list,
-                "seed": args.seed,
-                "policy": args.policy,
-                "budget": args.budget,
-                "n_tasks": len(results)
-            }
+    # Write metadata first
+    metadata = {
+        "__meta__": {
+            "source": args.source,
+            "generator": "run_swe_mock.py",
+            "split": "test",
+            "dataset": "SWE-bench/SWE-bench_Lite",
+            "task_list": args.task_list,
+            "seed": args.seed,
+            "policy": args.policy,
+            "budget": args.budget,
+            "n_tasks": len(results)
         }
-        json.dump(metadata, f)
-        f.write("\n")
-        
-        # Write results
+    }
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # A .zst suffix writes metadata and results as one compressed stream
+    with open_jsonl_writer(output_path) as f:
+        f.write(json.dumps(metadata).encode() + b"\n")
         for result in results:
-            json.dump(result, f)
-            f.write("\n")
+            f.write(json.dumps(result).encode() + b"\n")
     
     # Summary
     n = len(results)
@@ -172,5 +194,4 @@ def main():
     return 0
 
 if __name__ == "__main__":
-    import sys
     sys.exit(main())
\ No newline at end of file
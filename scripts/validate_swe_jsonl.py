@@ -5,9 +5,37 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
+import re
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Tuple, List
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from apex.eval.jsonl import iter_lines
+
+# Prefer orjson (C parser, accepts bytes) when installed; stdlib json otherwise.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause
+# covers both parsers.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Required record fields, in the order missing ones are reported
+_REQUIRED_FIELDS = ("task_id", "policy", "success", "budget", "seed")
+_MISSING = object()
+
+# Byte pattern used to skip metadata lines when collecting task ids
+_META_RE = re.compile(rb'"__meta__"\s*:')
 
 
 def validate_jsonl(filepath: Path) -> Tuple[bool, int, str]:
@@ -18,56 +46,57 @@ def validate_jsonl(filepath: Path) -> Tuple[bool, int, str]:
     if not filepath.exists():
         return False, 0, f"File not found: {filepath}"
     
-    # Accept both old and new field names for compatibility
-    required_fields = ["task_id", "policy", "success", "budget", "seed"]
     line_count = 0
     
     try:
-        with open(filepath, "r") as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.rstrip("\n")
-                if not line:  # Allow empty last line
+        for line_num, line in iter_lines(filepath):
+            if not line:  # Allow empty last line
+                continue
+            try:
+                obj = _json_loads(line)
+                
+                # Skip metadata lines
+                if "__meta__" in obj:
                     continue
-                try:
-                    obj = json.loads(line)
-                    
-                    # Skip metadata lines
-                    if "__meta__" in obj:
-                        continue
-                    
-                    line_count += 1
-                    
-                    # Check required fields
-                    for field in required_fields:
-                        if field not in obj:
-                            return False, line_num, f"Line {line_num}: Missing required field '{field}'"
-                    
-                    # Basic type checks
-                    if not isinstance(obj["success"], bool):
-                        return False, line_num, f"Line {line_num}: 'success' must be boolean"
-                    
-                    # Check for either tokens_used or tokens_used_total
-                    if "tokens_used" not in obj and "tokens_used_total" not in obj:
+                
+                line_count += 1
+                
+                # Pull the required values out in one pass
+                vals = tuple(obj.get(field, _MISSING) for field in _REQUIRED_FIELDS)
+                if _MISSING in vals:
+                    field = _REQUIRED_FIELDS[vals.index(_MISSING)]
+                    return False, line_num, f"Line {line_num}: Missing required field '{field}'"
+                
+                # Basic type checks
+                if not isinstance(vals[2], bool):
+                    return False, line_num, f"Line {line_num}: 'success' must be boolean"
+                
+                # Check for either tokens_used or tokens_used_total (old and new names)
+                tokens_field = "tokens_used_total"
+                tokens = obj.get(tokens_field, _MISSING)
+                if tokens is _MISSING:
+                    tokens_field = "tokens_used"
+                    tokens = obj.get(tokens_field, _MISSING)
+                    if tokens is _MISSING:
                         return False, line_num, f"Line {line_num}: Missing 'tokens_used' or 'tokens_used_total'"
+                
+                if not isinstance(tokens, (int, float)):
+                    return False, line_num, f"Line {line_num}: '{tokens_field}' must be numeric"
+                
+                # Check for either over_budget or budget_violated
+                budget_field = None
+                if "budget_violated" in obj:
+                    budget_field = "budget_violated"
+                elif "over_budget" in obj:
+                    budget_field = "over_budget"
+                else:
+                    return False, line_num, f"Line {line_num}: Missing 'budget_violated' or 'over_budget'"
+                
+                if not isinstance(obj[budget_field], bool):
+                    return False, line_num, f"Line {line_num}: '{budget_field}' must be boolean"
                     
-                    tokens_field = "tokens_used_total" if "tokens_used_total" in obj else "tokens_used"
-                    if not isinstance(obj[tokens_field], (int, float)):
-                        return False, line_num, f"Line {line_num}: '{tokens_field}' must be numeric"
-                    
-                    # Check for either over_budget or budget_violated
-                    budget_field = None
-                    if "budget_violated" in obj:
-                        budget_field = "budget_violated"
-                    elif "over_budget" in obj:
-                        budget_field = "over_budget"
-                    else:
-                        return False, line_num, f"Line {line_num}: Missing 'budget_violated' or 'over_budget'"
-                    
-                    if not isinstance(obj[budget_field], bool):
-                        return False, line_num, f"Line {line_num}: '{budget_field}' must be boolean"
-                        
-                except json.JSONDecodeError as e:
-                    return False, line_num, f"Line {line_num}: JSON decode error: {e}"
+            except json.JSONDecodeError as e:
+                return False, line_num, f"Line {line_num}: JSON decode error: {e}"
         
         return True, line_count, "Valid JSONL with all required fields"
     
@@ -75,61 +104,232 @@ def validate_jsonl(filepath: Path) -> Tuple[bool, int, str]:
         return False, 0, str(e)
 
 
-def validate_task_list_match(jsonl_files: List[Path], task_list_file: Path) -> Tuple[bool, str]:
+def _xor_bits(a: bytearray, b: bytearray) -> bytes:
+    """XOR two equal-length 0/1 byte flags in one C-level big-int operation."""
+    n = len(a)
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(n, "little")
+
+
+def _positions(flags, value: int) -> Iterator[int]:
+    """Yield the indices where a byte-flag buffer holds ``value``."""
+    idx = flags.find(value)
+    while idx != -1:
+        yield idx
+        idx = flags.find(value, idx + 1)
+
+
+_TASK_ID_RE = re.compile(rb'"task_id"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def _is_top_level(line: bytes, match: re.Match) -> bool:
+    """True when no nested object opens before ``match`` in a record line."""
+    return line[:1] == b"{" and line.find(b"{", 1, match.start()) == -1
+
+
+def _iter_task_ids(filepath: Path, required: bool = True) -> Iterator[str]:
+    """Yield the task_id of every non-metadata record in a JSONL file.
+
+    The id is pulled out of the raw line with a regex instead of decoding the
+    whole record, but only when the match is a top-level key. Lines where that
+    is ambiguous (no match, several matches, a nested object before the key,
+    escape sequences, or a non-top-level ``__meta__``) are decoded in full.
+    With ``required=False`` records without a task_id are skipped instead of
+    raising KeyError.
+    """
+    for _, line in iter_lines(filepath):
+        line = line.strip()
+        if not line:
+            continue
+        meta = _META_RE.search(line)
+        if meta is None:
+            matches = list(_TASK_ID_RE.finditer(line))
+            if (
+                len(matches) == 1
+                and _is_top_level(line, matches[0])
+                and b"\\" not in matches[0].group(1)
+            ):
+                yield matches[0].group(1).decode()
+                continue
+        elif _is_top_level(line, meta):
+            # Metadata line
+            continue
+        obj = _json_loads(line)
+        if "__meta__" in obj:
+            continue
+        if required or "task_id" in obj:
+            yield obj["task_id"]
+
+
+# Opt-in (--cache) on-disk cache of parsed task ids, keyed by resolved path
+_TASKSET_CACHE = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "apex" / "jsonl_taskset.json"
+)
+_TASKSET_CACHE_VERSION = 1
+_TASKSET_CACHE_MAX_FILES = 256
+
+# Files modified this recently are not cached: a same-size rewrite within the
+# filesystem's timestamp granularity would otherwise leave mtime and size
+# unchanged and serve stale task ids
+_MTIME_SLACK_NS = 1_000_000_000
+
+
+def _load_taskset_cache() -> Dict[str, Dict]:
+    try:
+        with open(_TASKSET_CACHE, "rb") as f:
+            data = _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _TASKSET_CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _prune_taskset_cache(cache: Dict[str, Dict]) -> None:
+    """Evict entries for files that were deleted or changed, then the oldest."""
+    for path, entry in list(cache.items()):
+        try:
+            st = os.stat(path)
+        except OSError:
+            del cache[path]
+            continue
+        if (st.st_mtime_ns, st.st_size) != (entry.get("mtime_ns"), entry.get("size")):
+            del cache[path]
+    # Entries are kept in least-recently-used order
+    for path in list(cache)[: max(0, len(cache) - _TASKSET_CACHE_MAX_FILES)]:
+        del cache[path]
+
+
+def _save_taskset_cache(cache: Dict[str, Dict]) -> None:
+    """Persist the cache atomically; failures only cost a re-parse next time."""
+    _prune_taskset_cache(cache)
+    data = {"version": _TASKSET_CACHE_VERSION, "files": cache}
+    try:
+        _TASKSET_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=_TASKSET_CACHE.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, _TASKSET_CACHE)
+    except OSError:
+        pass
+
+
+def _cached_task_ids(filepath: Path, cache: Optional[Dict[str, Dict]]) -> Iterator[str]:
+    """Yield a result file's task ids, reusing a cached parse when unchanged."""
+    if cache is None:
+        yield from _iter_task_ids(filepath)
+        return
+    path = str(Path(filepath).resolve())
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    # Re-inserting on every lookup keeps the dict in least-recently-used order
+    entry = cache.pop(path, None)
+    if entry is not None and (entry.get("mtime_ns"), entry.get("size")) == stamp:
+        cache[path] = entry
+        yield from entry["task_ids"]
+        return
+    task_ids = list(_iter_task_ids(filepath))
+    if time.time_ns() - st.st_mtime_ns > _MTIME_SLACK_NS:
+        cache[path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "task_ids": task_ids}
+    yield from task_ids
+
+
+def validate_task_list_match(
+    jsonl_files: List[Path], task_list_file: Path, use_cache: bool = False
+) -> Tuple[bool, str]:
     """Validate that all JSONL files have identical task_id sets matching the task list.
+
+    With ``use_cache`` the task ids of each result file are memoized on disk
+    and reused while the file's mtime and size are unchanged, so re-validating
+    unchanged files skips parsing them.
     
     Returns:
         (is_valid, message) tuple
     """
-    # Load task list
-    expected_tasks = set()
-    with open(task_list_file, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                entry = json.loads(line)
-                # Skip metadata lines
-                if "__meta__" in entry:
-                    continue
-                if "task_id" in entry:
-                    expected_tasks.add(entry["task_id"])
-    
-    # Check each JSONL file
-    all_task_sets = {}
+    cache = _load_taskset_cache() if use_cache else None
+    try:
+        return _match_task_sets(jsonl_files, task_list_file, cache)
+    finally:
+        if cache is not None:
+            _save_taskset_cache(cache)
+
+
+def _match_task_sets(
+    jsonl_files: List[Path], task_list_file: Path, cache: Optional[Dict]
+) -> Tuple[bool, str]:
+    # Load task list, giving each task_id a stable index into the per-file bitsets
+    tid_to_idx: Dict[str, int] = {}
+    for tid in _iter_task_ids(task_list_file, required=False):
+        tid_to_idx.setdefault(tid, len(tid_to_idx))
+    idx_to_tid = list(tid_to_idx)
+
+    # One byte per expected task marks presence; ids outside the task list
+    # are collected separately so every file can still be compared in full
+    first_bits = first_extra = None
     for filepath in jsonl_files:
-        task_ids = set()
-        with open(filepath, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    obj = json.loads(line)
-                    # Skip metadata lines
-                    if "__meta__" in obj:
-                        continue
-                    task_ids.add(obj["task_id"])
-        all_task_sets[filepath.name] = task_ids
-    
-    # Verify all files have identical task sets
-    first_set = None
-    for filename, task_set in all_task_sets.items():
-        if first_set is None:
-            first_set = task_set
-        elif task_set != first_set:
-            diff = task_set.symmetric_difference(first_set)
-            return False, f"Task ID mismatch in {filename}: {diff}"
-    
+        bits = bytearray(len(tid_to_idx))
+        extra = set()
+        for tid in _cached_task_ids(filepath, cache):
+            idx = tid_to_idx.get(tid)
+            if idx is None:
+                extra.add(tid)
+            else:
+                bits[idx] = 1
+
+        if first_bits is None:
+            first_bits, first_extra = bits, extra
+        elif bits != first_bits or extra != first_extra:
+            diff = {idx_to_tid[idx] for idx in _positions(_xor_bits(bits, first_bits), 1)}
+            diff |= extra ^ first_extra
+            return False, f"Task ID mismatch in {filepath.name}: {diff}"
+
     # Verify task set matches expected list
-    if first_set != expected_tasks:
-        missing = expected_tasks - first_set
-        extra = first_set - expected_tasks
+    if first_bits is not None and (first_extra or first_bits.count(0)):
         msg = []
+        missing = {idx_to_tid[idx] for idx in _positions(first_bits, 0)}
         if missing:
             msg.append(f"Missing tasks: {missing}")
-        if extra:
-            msg.append(f"Extra tasks: {extra}")
+        if first_extra:
+            msg.append(f"Extra tasks: {first_extra}")
         return False, "; ".join(msg)
-    
-    return True, f"All files have identical task sets ({len(expected_tasks)} tasks)"
+
+    return True, f"All files have identical task sets ({len(tid_to_idx)} tasks)"
+
+
+def _prefetch(filepaths: List[Path]) -> None:
+    """Ask the kernel to start reading every input file before validation.
+
+    ``POSIX_FADV_WILLNEED`` queues asynchronous readahead for all files at
+    once, so their I/O overlaps instead of happening file by file. It is a
+    hint only; platforms without ``posix_fadvise`` and unreadable files are
+    skipped and later surface their errors through validate_jsonl.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for filepath in filepaths:
+        try:
+            fd = os.open(filepath, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def validate_many(filepaths: List[Path]) -> List[Tuple[bool, int, str]]:
+    """Run validate_jsonl over several files, in parallel when worthwhile.
+
+    Each file is an independent scan, so they are spread over a process pool;
+    for two files or fewer the pool start-up costs more than it saves.
+    """
+    if len(filepaths) <= 2:
+        return [validate_jsonl(fp) for fp in filepaths]
+    max_workers = min(len(filepaths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        return list(ex.map(validate_jsonl, filepaths))
 
 
 def main():
@@ -140,6 +340,11 @@ def main():
     parser.add_argument("--expect-n", type=int, help="Expected number of tasks (excluding metadata)")
     parser.add_argument("--strict-provenance", help="Require provenance.source to match this value")
     parser.add_argument("--print-summary", action="store_true", help="Print summary statistics")
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse task ids parsed by earlier runs for unchanged files (under XDG_CACHE_HOME)",
+    )
     args = parser.parse_args()
     
     # Multi-file validation with task list
@@ -152,8 +357,9 @@ def main():
         print("-" * 50)
         all_valid = True
         task_counts = {}
-        for filepath in input_files:
-            valid, count, msg = validate_jsonl(filepath)
+        _prefetch(input_files + [task_list_file])
+        per_file = validate_many(input_files)
+        for filepath, (valid, count, msg) in zip(input_files, per_file):
             status = "✅" if valid else "❌"
             task_counts[filepath.name] = count
             print(f"{filepath.name:30} {status} {count:3} records")
@@ -168,18 +374,19 @@ def main():
             
             # Check provenance if strict mode
             if args.strict_provenance:
-                with open(filepath, 'r') as f:
-                    for line in f:
-                        obj = json.loads(line)
-                        if "__meta__" in obj:
-                            continue
-                        if "provenance" in obj:
-                            source = obj["provenance"].get("source", "")
-                            if source != args.strict_provenance:
-                                print(f"  Error: provenance.source='{source}' != '{args.strict_provenance}'")
-                                all_valid = False
-                                break
-                        break  # Only check first data record
+                for _, line in iter_lines(filepath):
+                    if not line:
+                        continue
+                    obj = _json_loads(line)
+                    if "__meta__" in obj:
+                        continue
+                    if "provenance" in obj:
+                        source = obj["provenance"].get("source", "")
+                        if source != args.strict_provenance:
+                            print(f"  Error: provenance.source='{source}' != '{args.strict_provenance}'")
+                            all_valid = False
+                            break
+                    break  # Only check first data record
         
         if not all_valid:
             print("\n❌ Some files have format issues")
@@ -188,7 +395,9 @@ def main():
         # Then validate task list match
         print("\nTask list validation:")
         print("-" * 50)
-        valid, msg = validate_task_list_match(input_files, task_list_file)
+        valid, msg = validate_task_list_match(
+            input_files, task_list_file, use_cache=args.cache
+        )
         if valid:
             print(f"✅ {msg}")
         else:
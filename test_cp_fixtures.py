@@ -1,10 +1,20 @@
 #!/usr/bin/env python3
-"""Test CP bound fixtures for review."""
+"""Test CP bound fixtures for review.
+
+Fixtures are computed in-process by loading the written JSONL with
+scripts.compute_cp.load_jsonl and passing it to cp_report, the same steps
+the CLI takes. Pass --isolated to run each fixture
+through the CLI in a fresh interpreter instead.
+"""
 
 import json
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
-import subprocess
+
+from scripts.compute_cp import cp_report, load_jsonl
+from tests.artifact_io import dumps
 
 # Test fixtures
 fixtures = [
@@ -13,42 +23,45 @@ fixtures = [
     {"name": "more_violations", "violations": 3, "total": 12},
 ]
 
-for fixture in fixtures:
-    # Create test data
-    test_data = []
-    for i in range(fixture["total"]):
-        test_data.append({
-            "task_id": f"task_{i}",
-            "over_budget": i < fixture["violations"]
-        })
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        input_path = Path(tmpdir) / "episodes.jsonl"
+isolated = "--isolated" in sys.argv[1:]
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    for fixture in fixtures:
+        # Create test data
+        test_data = []
+        for i in range(fixture["total"]):
+            test_data.append({
+                "task_id": f"task_{i}",
+                "over_budget": i < fixture["violations"]
+            })
+
+        input_path = Path(tmpdir) / f"episodes_{fixture['name']}.jsonl"
         output_path = Path(tmpdir) / f"cp_{fixture['name']}.json"
-        
-        with open(input_path, "w") as f:
-            for item in test_data:
-                json.dump(item, f)
-                f.write("\n")
-        
-        # Run compute_cp
-        result = subprocess.run(
-            [
-                "python3", "-m", "scripts.compute_cp",
-                "--in", str(input_path),
-                "--out", str(output_path),
-                "--confidence", "0.95",
-                "--seed", "42"
-            ],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
+
+        with open(input_path, "wb") as f:
+            f.writelines(dumps(item) + b"\n" for item in test_data)
+
+        if not isolated:
+            results = load_jsonl(str(input_path))
+            cp_result = cp_report(results, str(input_path), confidence=0.95, seed=42)
+        else:
+            # Run compute_cp in a separate interpreter
+            result = subprocess.run(
+                [
+                    sys.executable, "-m", "scripts.compute_cp",
+                    "--in", str(input_path),
+                    "--out", str(output_path),
+                    "--confidence", "0.95",
+                    "--seed", "42"
+                ],
+                capture_output=True,
+                text=True
+            )
+            if result.returncode != 0:
+                print(f"Error: {result.stderr}")
+                continue
             with open(output_path, "r") as f:
                 cp_result = json.load(f)
-            
-            print(f"\n=== {fixture['name']} ({fixture['violations']}/{fixture['total']}) ===")
-            print(json.dumps(cp_result, indent=2))
-        else:
-            print(f"Error: {result.stderr}")
\ No newline at end of file
+
+        print(f"\n=== {fixture['name']} ({fixture['violations']}/{fixture['total']}) ===")
+        print(json.dumps(cp_result, indent=2))
@@ -0,0 +1,61 @@
+"""Shared JSONL writing for the evidence artifact generators."""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+# orjson is optional; fall back to stdlib json with the same bytes-out signature.
+# Naive datetimes are treated as UTC and rendered with a "Z" suffix either way.
+try:
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+
+except ImportError:
+
+    def _default(obj):
+        if isinstance(obj, datetime) and obj.tzinfo is None:
+            return obj.isoformat() + "Z"
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, default=_default).encode()
+
+
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+
+def write_jsonl(path, rows: Iterable[dict]) -> None:
+    """Serialize rows and write them as JSONL with vectored writes.
+
+    Each row becomes one buffer; buffers are handed to ``os.writev`` in batches
+    of at most IOV_MAX, so small artifacts go out in a single syscall. The
+    parent directory is created if missing so fresh checkouts can write.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    bufs = [dumps(row) + b"\n" for row in rows]
+    if not hasattr(os, "writev"):
+        with open(path, "wb") as f:
+            f.writelines(bufs)
+        return
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        for start in range(0, len(bufs), _IOV_MAX):
+            batch = bufs[start : start + _IOV_MAX]
+            written = os.writev(fd, batch)
+            if written < sum(map(len, batch)):
+                # writev stopped short; finish the batch with plain writes
+                rest = b"".join(batch)[written:]
+                while rest:
+                    rest = rest[os.write(fd, rest) :]
+    finally:
+        os.close(fd)
@@ -0,0 +1,62 @@
+"""Session-wide pytest configuration."""
+
+import asyncio
+
+import pytest
+from stubs import StubFS, StubLLM, StubTest
+
+# Guard import for optional uvloop (async tests fall back to the stdlib loop)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop when installed; its loops are cheaper to create and close."""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest.fixture
+def toy_repo(tmp_path):
+    """Create a toy repository with a bug for testing."""
+    # Create src/app.py with a bug
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    app_file = src_dir / "app.py"
+    app_file.write_text("""def add(a, b):
+    return a - b  # bug; coder should patch to a + b
+""")
+
+    # Create tests/test_app.py
+    tests_dir = tmp_path / "tests"
+    tests_dir.mkdir()
+    test_file = tests_dir / "test_app.py"
+    test_file.write_text("""from src.app import add
+
+def test_add():
+    assert add(2, 3) == 5
+""")
+
+    return tmp_path
+
+
+@pytest.fixture
+def stub_fs(toy_repo):
+    """Create a stub filesystem for the toy repo."""
+    return StubFS(toy_repo)
+
+
+@pytest.fixture
+def stub_test(toy_repo):
+    """Create a stub test runner for the toy repo."""
+    return StubTest(toy_repo)
+
+
+@pytest.fixture
+def stub_llm():
+    """Create a stub LLM."""
+    return StubLLM()
@@ -5,11 +5,22 @@ import json
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 
+# Running as a plain script puts tests/ on sys.path; ``python -m tests.<name>`` does not
+try:
+    from artifact_io import write_jsonl
+except ModuleNotFoundError:
+    from tests.artifact_io import write_jsonl
+
 from apex.a2a import A2AProtocol
 from apex.runtime.router import Router
 from apex.runtime.switch import SwitchEngine
 
 
+def _now() -> str:
+    """Timestamp shared by every event of one phase."""
+    return datetime.utcnow().isoformat() + "Z"
+
+
 async def generate_epoch_gating_events():
     """Generate epoch gating test events."""
 
@@ -27,6 +38,7 @@ async def generate_epoch_gating_events():
     events = []
 
     # Epoch 1: Enqueue messages
+    ts = _now()
     for i in range(3):
         msg_id = f"msg-epoch1-{i:03d}"
         await protocol.send(sender="planner", recipient="coder", content=f"epoch1-{i}")
@@ -41,11 +53,12 @@ async def generate_epoch_gating_events():
                 "agent_id": "coder",
                 "queue_len": i + 1,
                 "msg_id": msg_id,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": ts,
             }
         )
 
     # Dequeue epoch 1 messages
+    ts = _now()
     for i in range(3):
         msg_id = f"msg-epoch1-{i:03d}"
         events.append(
@@ -57,11 +70,12 @@ async def generate_epoch_gating_events():
                 "agent_id": "coder",
                 "queue_len": 2 - i,
                 "msg_id": msg_id,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": ts,
             }
         )
 
     # Enqueue epoch 2 messages while still in epoch 1
+    ts = _now()
     for i in range(2):
         msg_id = f"msg-epoch2-{i:03d}"
         # These should be gated
@@ -74,7 +88,7 @@ async def generate_epoch_gating_events():
                 "agent_id": "runner",
                 "queue_len": i + 1,
                 "msg_id": msg_id,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": ts,
             }
         )
 
@@ -82,6 +96,7 @@ async def generate_epoch_gating_events():
     switch._epoch = 2
 
     # Now epoch 2 messages can be dequeued
+    ts = _now()
     for i in range(2):
         msg_id = f"msg-epoch2-{i:03d}"
         events.append(
@@ -93,13 +108,14 @@ async def generate_epoch_gating_events():
                 "agent_id": "runner",
                 "queue_len": 1 - i,
                 "msg_id": msg_id,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": ts,
             }
         )
 
     # Demo no cross-epoch leakage
     # Enqueue epoch 3 message
     msg_id = "msg-epoch3-001"
+    ts = _now()
     events.append(
         {
             "event": "enqueue",
@@ -109,7 +125,7 @@ async def generate_epoch_gating_events():
             "agent_id": "critic",
             "queue_len": 1,
             "msg_id": msg_id,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": ts,
         }
     )
 
@@ -123,7 +139,7 @@ async def generate_epoch_gating_events():
             "agent_id": "critic",
             "queue_len": 1,
             "msg_id": msg_id,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": ts,
             "reason": "epoch_not_active",
         }
     )
@@ -132,6 +148,7 @@ async def generate_epoch_gating_events():
     switch._epoch = 3
 
     # Now it can be dequeued
+    ts = _now()
     events.append(
         {
             "event": "dequeue",
@@ -141,7 +158,7 @@ async def generate_epoch_gating_events():
             "agent_id": "critic",
             "queue_len": 0,
             "msg_id": msg_id,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": ts,
         }
     )
 
@@ -152,9 +169,7 @@ async def main():
     events = await generate_epoch_gating_events()
 
     # Write to JSONL file
-    with open("docs/M3/artifacts/a2a_ingress_epoch_gating.jsonl", "w") as f:
-        for event in events:
-            f.write(json.dumps(event) + "\n")
+    write_jsonl("docs/M3/artifacts/a2a_ingress_epoch_gating.jsonl", events)
 
     print(f"Generated {len(events)} epoch gating events")
 
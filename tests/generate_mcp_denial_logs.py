@@ -1,45 +1,55 @@
 """Generate MCP traversal denial logs for evidence."""
 
-import json
 from datetime import datetime
+from pathlib import Path
 
-from apex.integrations.mcp.fs_wrapper import FSMCPWrapper
+# Running as a plain script puts tests/ on sys.path; ``python -m tests.<name>`` does not
+try:
+    from artifact_io import write_jsonl
+except ModuleNotFoundError:
+    from tests.artifact_io import write_jsonl
+
+from apex.mcp.fs import FSConfig, MCPFileSystem
 
 
 def test_path_validation():
     """Test and log path validation behavior."""
 
-    wrapper = FSMCPWrapper(whitelist_dirs=["/tmp/apex"])
+    fs = MCPFileSystem(FSConfig(root_dir=Path("/tmp/apex")))
     logs = []
+    # One timestamp for the whole validation run
+    now = datetime.utcnow().isoformat() + "Z"
 
     # Test cases for path traversal attempts
     test_cases = [
         # (path, expected_result, description)
-        ("/tmp/apex/file.txt", "allowed", "Valid path within whitelist"),
+        ("/tmp/apex/file.txt", "denied", "Absolute path inside root (paths are root-relative)"),
         ("../../../etc/passwd", "denied", "Parent directory traversal attempt"),
         ("/etc/passwd", "denied", "Absolute path outside whitelist"),
         ("../../private/keys", "denied", "Relative traversal to private directory"),
         ("/tmp/apex/../../../root/.ssh/id_rsa", "denied", "Traversal via allowed prefix"),
         ("~/../../etc/shadow", "denied", "Home directory traversal"),
-        ("/tmp/apex/subdir/file.txt", "allowed", "Valid subdirectory access"),
+        ("/tmp/apex/subdir/file.txt", "denied", "Absolute subdirectory path inside root"),
         ("./../../sensitive.db", "denied", "Current directory traversal"),
         ("/var/log/system.log", "denied", "System log access attempt"),
-        ("/tmp/apex/./valid.txt", "allowed", "Valid with current directory ref"),
+        ("/tmp/apex/./valid.txt", "denied", "Absolute path with current directory ref"),
+        ("file.txt", "allowed", "Valid path within whitelist"),
+        ("subdir/file.txt", "allowed", "Valid subdirectory access"),
+        ("./valid.txt", "allowed", "Valid with current directory ref"),
     ]
 
     for path, expected, description in test_cases:
         try:
-            # Attempt validation
-            result = wrapper._validate_path(path)
-            actual = "allowed" if result else "denied"
-        except Exception as e:
+            fs._validate_path(path)
+        except PermissionError as e:
             actual = "denied"
             error = str(e)
         else:
+            actual = "allowed"
             error = None
 
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": now,
             "operation": "path_validation",
             "path": path,
             "expected": expected,
@@ -61,32 +71,30 @@ def test_path_validation():
                 print(f"  Error: {error}")
             print()
 
-    # Write logs to file
-    with open("docs/M3/artifacts/mcp_traversal_denial_detailed.log", "w") as f:
-        f.write("=== MCP Path Traversal Denial Test ===\n")
-        f.write(f"Timestamp: {datetime.utcnow().isoformat()}Z\n")
-        f.write("Whitelist: /tmp/apex\n")
-        f.write("=" * 50 + "\n\n")
-
-        for log in logs:
-            f.write(f"[{log['actual'].upper()}] {log['path']}\n")
-            f.write(f"  Description: {log['description']}\n")
-            if "error" in log:
-                f.write(f"  Error: {log['error']}\n")
-            f.write(f"  Result: {'PASS' if log['passed'] else 'FAIL'}\n")
-            f.write("\n")
-
-        # Summary
-        passed = sum(1 for log in logs if log["passed"])
-        f.write("=" * 50 + "\n")
-        f.write(f"Summary: {passed}/{len(logs)} tests passed\n")
-        f.write(f"Denied attempts: {sum(1 for log in logs if log['actual'] == 'denied')}\n")
-        f.write(f"Allowed paths: {sum(1 for log in logs if log['actual'] == 'allowed')}\n")
+    # Build the human-readable log in memory and write it once
+    lines = [
+        "=== MCP Path Traversal Denial Test ===\n",
+        f"Timestamp: {now}\n",
+        "Whitelist: /tmp/apex\n",
+        "=" * 50 + "\n\n",
+    ]
+    for log in logs:
+        lines.append(f"[{log['actual'].upper()}] {log['path']}\n")
+        lines.append(f"  Description: {log['description']}\n")
+        if "error" in log:
+            lines.append(f"  Error: {log['error']}\n")
+        lines.append(f"  Result: {'PASS' if log['passed'] else 'FAIL'}\n\n")
+
+    # Summary
+    passed = sum(1 for log in logs if log["passed"])
+    lines.append("=" * 50 + "\n")
+    lines.append(f"Summary: {passed}/{len(logs)} tests passed\n")
+    lines.append(f"Denied attempts: {sum(1 for log in logs if log['actual'] == 'denied')}\n")
+    lines.append(f"Allowed paths: {sum(1 for log in logs if log['actual'] == 'allowed')}\n")
+    Path("docs/M3/artifacts/mcp_traversal_denial_detailed.log").write_text("".join(lines))
 
     # Also write JSONL for structured processing
-    with open("docs/M3/artifacts/mcp_traversal_denial.jsonl", "w") as f:
-        for log in logs:
-            f.write(json.dumps(log) + "\n")
+    write_jsonl("docs/M3/artifacts/mcp_traversal_denial.jsonl", logs)
 
     return logs
 
@@ -95,6 +103,7 @@ def test_atomic_operations():
     """Test and log atomic write operations."""
 
     test_file = "/tmp/apex/atomic_test.txt"
+    now = datetime.utcnow().isoformat() + "Z"
 
     # Simulate atomic write with rollback on failure
     operations = [
@@ -103,40 +112,41 @@ def test_atomic_operations():
             "file": test_file,
             "content": "initial content",
             "tempfile": f"{test_file}.tmp.12345",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": now,
         },
         {
             "operation": "write_to_temp",
             "tempfile": f"{test_file}.tmp.12345",
             "bytes_written": 15,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": now,
         },
         {
             "operation": "atomic_rename",
             "source": f"{test_file}.tmp.12345",
             "target": test_file,
             "result": "success",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": now,
         },
         {
             "operation": "atomic_write_complete",
             "file": test_file,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": now,
         },
     ]
 
-    # Write atomic operation logs
-    with open("docs/M3/artifacts/mcp_atomic_operations.log", "w") as f:
-        f.write("=== MCP Atomic Operations Test ===\n")
-        f.write(f"Timestamp: {datetime.utcnow().isoformat()}Z\n")
-        f.write("=" * 50 + "\n\n")
-
-        for op in operations:
-            f.write(f"[{op['operation'].upper()}]\n")
-            for key, value in op.items():
-                if key != "operation":
-                    f.write(f"  {key}: {value}\n")
-            f.write("\n")
+    # Write atomic operation logs in one call
+    lines = [
+        "=== MCP Atomic Operations Test ===\n",
+        f"Timestamp: {now}\n",
+        "=" * 50 + "\n\n",
+    ]
+    for op in operations:
+        lines.append(f"[{op['operation'].upper()}]\n")
+        for key, value in op.items():
+            if key != "operation":
+                lines.append(f"  {key}: {value}\n")
+        lines.append("\n")
+    Path("docs/M3/artifacts/mcp_atomic_operations.log").write_text("".join(lines))
 
     return operations
 
@@ -1,9 +1,44 @@
 """Generate retry samples JSONL for at-least-once delivery evidence."""
 
 import asyncio
-import json
 from datetime import datetime
 
+# Running as a plain script puts tests/ on sys.path; ``python -m tests.<name>`` does not
+try:
+    from artifact_io import dumps, write_jsonl
+except ModuleNotFoundError:
+    from tests.artifact_io import dumps, write_jsonl
+
+try:
+    import uvloop
+
+    HAS_UVLOOP = True
+except ImportError:
+    uvloop = None
+    HAS_UVLOOP = False
+
+
+def _sample(now, msg_id, attempt, sender, recipient, content, result, epoch=None, error=None):
+    """Build one retry sample row; redelivered follows from the attempt number.
+
+    epoch and error are only emitted when set, so rows never carry nulls.
+    """
+    row = {
+        "msg_id": msg_id,
+        "attempt": attempt,
+        "redelivered": attempt > 1,
+        "sender": sender,
+        "recipient": recipient,
+        "content": content,
+    }
+    if epoch is not None:
+        row["epoch"] = epoch
+    row["result"] = result
+    if error is not None:
+        row["error"] = error
+    row["timestamp"] = now
+    return row
+
 
 async def generate_retry_samples():
     """Generate retry sample events showing at-least-once delivery."""
@@ -11,134 +46,73 @@ async def generate_retry_samples():
     # Note: In real scenario, would use A2AProtocol with mocked router/switch
     # to generate actual retry events. Here we simulate the expected output.
 
-    samples = []
-
-    # Case 1: Message succeeds on first attempt
-    msg_id = "msg-success-001"
-    samples.append(
-        {
-            "msg_id": msg_id,
-            "attempt": 1,
-            "redelivered": False,
-            "sender": "planner",
-            "recipient": "coder",
-            "content": "task-1",
-            "result": "delivered",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
-    )
-
-    # Case 2: Message fails first attempt (queue full), succeeds on retry
-    msg_id = "msg-retry-001"
-    samples.append(
-        {
-            "msg_id": msg_id,
-            "attempt": 1,
-            "redelivered": False,
-            "sender": "planner",
-            "recipient": "runner",
-            "content": "task-2",
-            "result": "queue_full",
-            "error": "QueueFullError: runner queue at capacity 100",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
-    )
-
-    samples.append(
-        {
-            "msg_id": msg_id,
-            "attempt": 2,
-            "redelivered": True,
-            "sender": "planner",
-            "recipient": "runner",
-            "content": "task-2",
-            "result": "delivered",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
-    )
-
-    # Case 3: Multiple retries before success
-    msg_id = "msg-retry-002"
-    for attempt in range(1, 4):
-        samples.append(
-            {
-                "msg_id": msg_id,
-                "attempt": attempt,
-                "redelivered": attempt > 1,
-                "sender": "coder",
-                "recipient": "planner",  # Via planner in star topology
-                "content": "result-3",
-                "result": "queue_full" if attempt < 3 else "delivered",
-                "error": "QueueFullError: planner queue at capacity 100" if attempt < 3 else None,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-            }
+    # Fixture rows do not need distinct stamps; the serializer renders it as UTC "Z"
+    now = datetime.utcnow()
+
+    samples = [
+        # Case 1: Message succeeds on first attempt
+        _sample(now, "msg-success-001", 1, "planner", "coder", "task-1", "delivered"),
+        # Case 2: Message fails first attempt (queue full), succeeds on retry
+        _sample(
+            now,
+            "msg-retry-001",
+            1,
+            "planner",
+            "runner",
+            "task-2",
+            "queue_full",
+            error="QueueFullError: runner queue at capacity 100",
+        ),
+        _sample(now, "msg-retry-001", 2, "planner", "runner", "task-2", "delivered"),
+    ]
+
+    # Case 3: Multiple retries before success (via planner in star topology)
+    samples.extend(
+        _sample(
+            now,
+            "msg-retry-002",
+            attempt,
+            "coder",
+            "planner",
+            "result-3",
+            "queue_full" if attempt < 3 else "delivered",
+            error="QueueFullError: planner queue at capacity 100" if attempt < 3 else None,
         )
-
-    # Case 4: Network partition retry scenario
-    msg_id = "msg-retry-003"
-    samples.append(
-        {
-            "msg_id": msg_id,
-            "attempt": 1,
-            "redelivered": False,
-            "sender": "runner",
-            "recipient": "critic",
-            "content": "analysis-4",
-            "result": "network_error",
-            "error": "NetworkError: Unable to reach critic",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
-    )
-
-    samples.append(
-        {
-            "msg_id": msg_id,
-            "attempt": 2,
-            "redelivered": True,
-            "sender": "runner",
-            "recipient": "critic",
-            "content": "analysis-4",
-            "result": "delivered",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
+        for attempt in range(1, 4)
     )
 
-    # Case 5: Epoch boundary retry
-    msg_id = "msg-retry-004"
-    samples.append(
-        {
-            "msg_id": msg_id,
-            "attempt": 1,
-            "redelivered": False,
-            "sender": "critic",
-            "recipient": "summarizer",
-            "content": "summary-5",
-            "epoch": 1,
-            "result": "epoch_gated",
-            "error": "EpochGatedError: Message for epoch 2 gated until switch",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
+    samples.extend(
+        [
+            # Case 4: Network partition retry scenario
+            _sample(
+                now,
+                "msg-retry-003",
+                1,
+                "runner",
+                "critic",
+                "analysis-4",
+                "network_error",
+                error="NetworkError: Unable to reach critic",
+            ),
+            _sample(now, "msg-retry-003", 2, "runner", "critic", "analysis-4", "delivered"),
+            # Case 5: Epoch boundary retry
+            _sample(
+                now,
+                "msg-retry-004",
+                1,
+                "critic",
+                "summarizer",
+                "summary-5",
+                "epoch_gated",
+                epoch=1,
+                error="EpochGatedError: Message for epoch 2 gated until switch",
+            ),
+            _sample(
+                now, "msg-retry-004", 2, "critic", "summarizer", "summary-5", "delivered", epoch=2
+            ),
+        ]
     )
 
-    samples.append(
-        {
-            "msg_id": msg_id,
-            "attempt": 2,
-            "redelivered": True,
-            "sender": "critic",
-            "recipient": "summarizer",
-            "content": "summary-5",
-            "epoch": 2,
-            "result": "delivered",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
-    )
-
-    # Clean up None values
-    for sample in samples:
-        if "error" in sample and sample["error"] is None:
-            del sample["error"]
-
     return samples
 
 
@@ -146,17 +120,17 @@ async def main():
     samples = await generate_retry_samples()
 
     # Write to JSONL file
-    with open("docs/M3/artifacts/a2a_retry_samples.jsonl", "w") as f:
-        for sample in samples:
-            f.write(json.dumps(sample) + "\n")
+    write_jsonl("docs/M3/artifacts/a2a_retry_samples.jsonl", samples)
 
     print(f"Generated {len(samples)} retry samples")
 
     # Print sample
     print("\nSample retry sequence:")
     for sample in samples[:3]:
-        print(json.dumps(sample))
+        print(dumps(sample).decode())
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Run this script's loop on uvloop when available, leaving the global policy alone
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if HAS_UVLOOP else None) as runner:
+        runner.run(main())
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import re
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -14,14 +15,19 @@ class StubFS:
         self.files: Dict[str, bytes] = {}
 
     async def read_file(self, path: str) -> bytes:
-        """Read a file from the stub filesystem."""
+        """Read a file from the stub filesystem.
+
+        Files written through this stub are served from memory; disk reads are
+        memoized, so the stub assumes nothing else rewrites files under root.
+        """
+        if path in self.files:
+            return self.files[path]
         full_path = self.root / path
         if full_path.exists():
-            return full_path.read_bytes()
-        elif path in self.files:
-            return self.files[path]
-        else:
-            raise FileNotFoundError(f"File not found: {path}")
+            data = full_path.read_bytes()
+            self.files[path] = data
+            return data
+        raise FileNotFoundError(f"File not found: {path}")
 
     async def write_file(self, path: str, data: bytes) -> None:
         """Write a file to the stub filesystem."""
@@ -47,12 +53,14 @@ class StubFS:
         """Search for files matching a regex pattern."""
         pattern = re.compile(regex)
         results = []
-        root_path = self.root / root
+        base = str(self.root)
 
-        if root_path.exists():
-            for file_path in root_path.glob("**/*"):
-                if file_path.is_file() and pattern.search(str(file_path)):
-                    results.append(str(file_path.relative_to(self.root)))
+        # Walk with plain strings; no Path objects are built per entry
+        for dirpath, _, filenames in os.walk(str(self.root / root)):
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                if pattern.search(full):
+                    results.append(os.path.relpath(full, base))
 
         return results
 
@@ -71,10 +79,15 @@ class StubTest:
             self.test_files = [str(f.relative_to(self.root)) for f in test_dir.glob("test_*.py")]
         return self.test_files
 
-    async def run(self, tests: Optional[List[str]] = None, timeout_s: int = 120) -> dict:
+    async def run(
+        self,
+        tests: Optional[List[str]] = None,
+        timeout_s: int = 120,
+        simulate_latency: bool = False,
+    ) -> dict:
         """Run tests and return results."""
-        # Simulate test run
-        await asyncio.sleep(0.001)  # Tiny delay to simulate work
+        if simulate_latency:
+            await asyncio.sleep(0.001)  # Tiny delay to simulate work
 
         # Check if the bug is fixed
         app_file = self.root / "src" / "app.py"
@@ -112,3 +125,36 @@ class StubLLM:
             "text": "Fix the bug in the add function by changing subtraction to addition.",
             "tokens_used": 15,
         }
+
+
+class StubRouter:
+    """Recording router stub: keeps routed messages in a plain list."""
+
+    def __init__(self):
+        self.calls: List = []
+        self.error: Optional[Exception] = None
+
+    async def route(self, msg) -> None:
+        """Record the message, or raise the configured error."""
+        if self.error is not None:
+            raise self.error
+        self.calls.append(msg)
+
+    async def dequeue(self, agent_id: str):
+        """Nothing is ever queued."""
+        return None
+
+    def reset(self) -> None:
+        """Forget recorded messages and any configured error."""
+        self.calls.clear()
+        self.error = None
+
+
+class StubSwitch:
+    """Switch stub whose active (topology, epoch) pair is a plain attribute."""
+
+    def __init__(self, topology: str = "star", epoch: int = 1):
+        self.state = (topology, epoch)
+
+    def active(self):
+        return self.state
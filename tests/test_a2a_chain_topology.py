@@ -1,79 +1,71 @@
 """Tests for A2A chain topology enforcement and msg_id uniqueness."""
 
-from unittest.mock import AsyncMock, MagicMock
-
 import pytest
+from stubs import StubRouter, StubSwitch
+from test_helpers import assert_msg_id_shape
 
 from apex.a2a import A2AProtocol
 from apex.runtime.errors import InvalidRecipientError, QueueFullError
-from apex.runtime.router import Router
-from apex.runtime.switch import SwitchEngine
 
 
 @pytest.fixture
 def router():
-    """Create mock router."""
-    router = AsyncMock(spec=Router)
-    router.route = AsyncMock()
-    router.dequeue = AsyncMock()
-    return router
+    """Create recording router stub."""
+    return StubRouter()
 
 
 @pytest.fixture
 def switch():
-    """Create mock switch."""
-    switch = MagicMock(spec=SwitchEngine)
-    switch.active = MagicMock(return_value=("chain", 1))
-    return switch
+    """Create switch stub."""
+    return StubSwitch("chain", 1)
 
 
 class TestChainTopologyEnforcement:
     """Test chain topology next-hop enforcement."""
 
     @pytest.mark.asyncio
-    async def test_valid_chain_transitions(self, router, switch):
-        """Test valid chain hops succeed."""
-        protocol = A2AProtocol(router, switch, topology="chain")
-
-        # Valid transitions
-        valid_hops = [
+    @pytest.mark.parametrize(
+        "sender,recipient",
+        [
             ("planner", "coder"),
             ("coder", "runner"),
             ("runner", "critic"),
             ("critic", "summarizer"),
             ("summarizer", "planner"),
-        ]
+        ],
+    )
+    async def test_valid_chain_transitions(self, router, switch, sender, recipient):
+        """Test valid chain hops succeed."""
+        protocol = A2AProtocol(router, switch, topology="chain")
 
-        for sender, recipient in valid_hops:
-            # Should not raise
-            await protocol.send(sender=sender, recipient=recipient, content="test")
+        # Should not raise
+        await protocol.send(sender=sender, recipient=recipient, content="test")
 
-            # Verify message was routed
-            assert router.route.called
-            msg = router.route.call_args[0][0]
-            assert msg.sender == sender
-            assert msg.recipient == recipient
-            router.route.reset_mock()
+        # Verify message was routed
+        assert len(router.calls) == 1
+        msg = router.calls[-1]
+        assert msg.sender == sender
+        assert msg.recipient == recipient
 
     @pytest.mark.asyncio
-    async def test_invalid_chain_transitions_raise(self, router, switch):
-        """Test invalid chain hops are rejected."""
-        protocol = A2AProtocol(router, switch, topology="chain")
-
-        # Invalid transitions
-        invalid_hops = [
+    @pytest.mark.parametrize(
+        "sender,recipient",
+        [
             ("planner", "runner"),  # Skip coder
             ("runner", "planner"),  # Wrong direction
             ("coder", "critic"),  # Skip runner
             ("critic", "coder"),  # Backward jump
-        ]
+        ],
+    )
+    async def test_invalid_chain_transitions_raise(self, router, switch, sender, recipient):
+        """Test invalid chain hops are rejected."""
+        protocol = A2AProtocol(router, switch, topology="chain")
 
-        for sender, recipient in invalid_hops:
-            with pytest.raises(ValueError, match="Chain topology violation"):
-                await protocol.send(sender=sender, recipient=recipient, content="test")
+        with pytest.raises(ValueError, match="Chain topology violation"):
+            await protocol.send(sender=sender, recipient=recipient, content="test")
 
-            # Verify no message was routed
-            assert not router.route.called
+        # Verify no message was routed
+        assert not router.calls
 
     @pytest.mark.asyncio
     async def test_chain_requires_recipient(self, router, switch):
@@ -91,8 +83,8 @@ class TestChainTopologyEnforcement:
         await protocol.send(sender="planner", recipient="coder", content="test data")
 
         # Check message structure
-        assert router.route.called
-        msg = router.route.call_args[0][0]
+        assert router.calls
+        msg = router.calls[-1]
 
         # Required fields
         assert hasattr(msg, "episode_id")
@@ -105,7 +97,7 @@ class TestChainTopologyEnforcement:
         # Values
         assert msg.episode_id == "a2a-episode"
         assert msg.msg_id.startswith("msg-")
-        assert len(msg.msg_id) > 10  # UUID hex is 32 chars
+        assert len(msg.msg_id) > 10  # prefix + counter hex is 32 chars
         assert msg.sender == "planner"
         assert msg.recipient == "coder"
         assert msg.topo_epoch == 1
@@ -121,45 +113,32 @@ class TestMessageIdUniqueness:
 
     @pytest.mark.asyncio
     async def test_msg_id_unique_for_identical_content(self, router, switch):
-        """Test 10k messages with identical content have unique IDs."""
+        """Test 1k messages with identical content have unique IDs."""
         protocol = A2AProtocol(router, switch, topology="star")
 
-        msg_ids = set()
         identical_content = "exact same content"
 
         # Send many messages with identical content
-        for _ in range(10000):
+        for _ in range(1000):
             await protocol.send(sender="planner", recipient="coder", content=identical_content)
 
-            # Extract msg_id
-            msg = router.route.call_args[0][0]
-            msg_ids.add(msg.msg_id)
-            router.route.reset_mock()
+        assert len(router.calls) == 1000
+        msg_ids = {msg.msg_id for msg in router.calls}
 
         # All IDs must be unique
         assert (
-            len(msg_ids) == 10000
-        ), f"Duplicate msg_ids found! Only {len(msg_ids)} unique out of 10000"
+            len(msg_ids) == 1000
+        ), f"Duplicate msg_ids found! Only {len(msg_ids)} unique out of 1000"
 
     @pytest.mark.asyncio
-    async def test_msg_id_format_is_uuid_hex(self, router, switch):
-        """Test msg_id uses UUID hex format."""
+    async def test_msg_id_format_is_prefix_and_counter_hex(self, router, switch):
+        """Test msg_id is msg- plus 32 hex chars (process prefix + counter)."""
         protocol = A2AProtocol(router, switch, topology="star")
 
         await protocol.send(sender="planner", recipient="coder", content="test")
 
-        msg = router.route.call_args[0][0]
-        msg_id = msg.msg_id
-
-        # Format: msg-<uuid_hex>
-        assert msg_id.startswith("msg-")
-        hex_part = msg_id[4:]  # Remove "msg-" prefix
-
-        # UUID hex is 32 characters (128 bits / 4 bits per hex char)
-        assert len(hex_part) == 32
-
-        # All characters should be valid hex
-        assert all(c in "0123456789abcdef" for c in hex_part)
+        # Format: msg-<16 hex prefix><16 hex counter>
+        assert_msg_id_shape(router.calls[-1].msg_id)
 
 
 class TestErrorEnvelopes:
@@ -169,11 +148,11 @@ class TestErrorEnvelopes:
     async def test_invalid_recipient_returns_error_envelope(self, router, switch):
         """Test InvalidRecipientError returns A2A error envelope."""
         # Set switch to star topology for this test
-        switch.active.return_value = ("star", 1)
+        switch.state = ("star", 1)
         protocol = A2AProtocol(router, switch, topology="star")
 
         # Make router raise InvalidRecipientError
-        router.route.side_effect = InvalidRecipientError("unknown_agent")
+        router.error = InvalidRecipientError("unknown_agent")
 
         result = await protocol.send(sender="planner", recipient="unknown_agent", content="test")
 
@@ -187,11 +166,11 @@ class TestErrorEnvelopes:
     async def test_queue_full_returns_error_envelope(self, router, switch):
         """Test QueueFullError returns A2A error envelope."""
         # Set switch to star topology for this test
-        switch.active.return_value = ("star", 1)
+        switch.state = ("star", 1)
         protocol = A2AProtocol(router, switch, topology="star")
 
         # Make router raise QueueFullError
-        router.route.side_effect = QueueFullError("coder", 100)
+        router.error = QueueFullError("coder", 100)
 
         result = await protocol.send(sender="planner", recipient="coder", content="test")
 
@@ -209,7 +188,7 @@ class TestFlatTopologyFanout:
     async def test_fanout_at_limit_succeeds(self, router, switch):
         """Test fanout exactly at limit works."""
         # Set switch to flat topology for this test
-        switch.active.return_value = ("flat", 1)
+        switch.state = ("flat", 1)
         protocol = A2AProtocol(router, switch, topology="flat", fanout_limit=2)
 
         result = await protocol.send(
@@ -217,14 +196,14 @@ class TestFlatTopologyFanout:
         )
 
         # Should succeed
-        assert router.route.call_count == 2
+        assert len(router.calls) == 2
         assert "envelopes" in result
 
     @pytest.mark.asyncio
     async def test_fanout_exceeds_limit_raises(self, router, switch):
         """Test fanout over limit raises with exact message."""
         # Set switch to flat topology for this test
-        switch.active.return_value = ("flat", 1)
+        switch.state = ("flat", 1)
         protocol = A2AProtocol(router, switch, topology="flat", fanout_limit=2)
 
         with pytest.raises(ValueError) as exc_info:
@@ -238,4 +217,4 @@ class TestFlatTopologyFanout:
         assert "Recipients exceed fanout limit of 2" in str(exc_info.value)
 
         # Should not route any messages
-        assert not router.route.called
+        assert not router.calls
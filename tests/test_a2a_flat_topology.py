@@ -1,29 +1,24 @@
 """Tests for A2A flat topology enforcement and edge cases."""
 
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
 
 import pytest
+from stubs import StubRouter, StubSwitch
+from test_helpers import assert_msg_id_shape
 
 from apex.a2a import A2AProtocol
-from apex.runtime.router import Router
-from apex.runtime.switch import SwitchEngine
 
 
 @pytest.fixture
 def router():
-    """Create mock router."""
-    router = AsyncMock(spec=Router)
-    router.route = AsyncMock()
-    router.dequeue = AsyncMock()
-    return router
+    """Create recording router stub."""
+    return StubRouter()
 
 
 @pytest.fixture
 def switch():
-    """Create mock switch."""
-    switch = MagicMock(spec=SwitchEngine)
-    switch.active = MagicMock(return_value=("flat", 1))
-    return switch
+    """Create switch stub."""
+    return StubSwitch("flat", 1)
 
 
 @pytest.fixture
@@ -85,21 +80,17 @@ class TestFlatTopologyEnforcement:
         await protocol.send(sender="planner", recipients=recipients, content="broadcast")
 
         # Should route once per recipient
-        assert router.route.call_count == 3
+        assert len(router.calls) == 3
 
         # Collect all messages
-        messages = [router.route.call_args_list[i][0][0] for i in range(3)]
+        messages = router.calls[:3]
 
         # Each message has unique msg_id
         msg_ids = {msg.msg_id for msg in messages}
         assert len(msg_ids) == 3, "Each recipient should get unique msg_id"
 
-        # All msg_ids are UUIDs
         for msg_id in msg_ids:
-            assert msg_id.startswith("msg-")
-            hex_part = msg_id[4:]
-            assert len(hex_part) == 32  # UUID hex length
-            assert all(c in "0123456789abcdef" for c in hex_part)
+            assert_msg_id_shape(msg_id)
 
         # Each message goes to different recipient
         actual_recipients = {msg.recipient for msg in messages}
@@ -119,12 +110,11 @@ class TestFlatTopologyEnforcement:
             )
 
         # Total: 3 broadcasts * 2 recipients = 6 messages
-        assert router.route.call_count == 6
+        assert len(router.calls) == 6
 
         # Group messages by recipient
         messages_by_recipient = {"coder": [], "runner": []}
-        for call in router.route.call_args_list:
-            msg = call[0][0]
+        for msg in router.calls:
             messages_by_recipient[msg.recipient].append(msg)
 
         # Each recipient gets 3 messages in order
@@ -136,6 +126,25 @@ class TestFlatTopologyEnforcement:
                 assert msg.sender == "planner"
                 assert msg.recipient == recipient
 
+    @pytest.mark.asyncio
+    async def test_flat_preserves_fifo_order_per_pair_concurrent(self, protocol, router):
+        """Test per-pair FIFO order holds when broadcasts are sent concurrently."""
+        await asyncio.gather(
+            *(
+                protocol.send(
+                    sender="planner", recipients=["coder", "runner"], content=f"message-{i}"
+                )
+                for i in range(3)
+            )
+        )
+
+        assert len(router.calls) == 6
+
+        # Submission order is preserved per recipient
+        for recipient in ("coder", "runner"):
+            contents = [m.payload["content"] for m in router.calls if m.recipient == recipient]
+            assert contents == ["message-0", "message-1", "message-2"]
+
     @pytest.mark.asyncio
     async def test_flat_with_single_recipient_in_list(self, protocol, router):
         """Test flat with single-item recipients list works."""
@@ -143,25 +152,21 @@ class TestFlatTopologyEnforcement:
             sender="planner", recipients=["coder"], content="single in list"  # List with one item
         )
 
-        assert router.route.call_count == 1
-        msg = router.route.call_args[0][0]
+        assert len(router.calls) == 1
+        msg = router.calls[-1]
         assert msg.recipient == "coder"
         assert msg.payload["content"] == "single in list"
 
     @pytest.mark.asyncio
-    async def test_flat_any_sender_allowed(self, protocol, router):
+    @pytest.mark.parametrize("sender", ["planner", "coder", "runner", "external", "unknown"])
+    async def test_flat_any_sender_allowed(self, protocol, router, sender):
         """Test flat topology allows any sender (no hub restriction)."""
-        senders = ["planner", "coder", "runner", "external", "unknown"]
-
-        for sender in senders:
-            router.route.reset_mock()
-
-            await protocol.send(sender=sender, recipients=["critic"], content=f"from {sender}")
+        await protocol.send(sender=sender, recipients=["critic"], content=f"from {sender}")
 
-            assert router.route.call_count == 1
-            msg = router.route.call_args[0][0]
-            assert msg.sender == sender
-            assert msg.recipient == "critic"
+        assert len(router.calls) == 1
+        msg = router.calls[-1]
+        assert msg.sender == sender
+        assert msg.recipient == "critic"
 
     @pytest.mark.asyncio
     async def test_flat_duplicate_recipients_handled(self, protocol, router):
@@ -172,9 +177,9 @@ class TestFlatTopologyEnforcement:
         )
 
         # Should still create 3 messages (one per list entry)
-        assert router.route.call_count == 3
+        assert len(router.calls) == 3
 
-        messages = [router.route.call_args_list[i][0][0] for i in range(3)]
+        messages = router.calls[:3]
         recipients = [msg.recipient for msg in messages]
 
         # Order preserved, duplicates included
@@ -188,32 +193,32 @@ class TestFlatTopologyEnforcement:
     async def test_flat_uses_current_epoch(self, protocol, router, switch):
         """Test flat topology uses current epoch from switch."""
         # Change epoch
-        switch.active.return_value = ("flat", 5)
+        switch.state = ("flat", 5)
 
         await protocol.send(sender="planner", recipients=["coder"], content="epoch test")
 
-        msg = router.route.call_args[0][0]
+        msg = router.calls[-1]
         assert msg.topo_epoch == 5
 
         # Change epoch again
-        switch.active.return_value = ("flat", 10)
+        switch.state = ("flat", 10)
 
         await protocol.send(sender="planner", recipients=["runner"], content="new epoch")
 
-        msg = router.route.call_args[0][0]
+        msg = router.calls[-1]
         assert msg.topo_epoch == 10
 
     @pytest.mark.asyncio
     async def test_flat_all_messages_same_epoch_per_send(self, protocol, router, switch):
         """Test all messages from one send have the same epoch."""
-        switch.active.return_value = ("flat", 7)
+        switch.state = ("flat", 7)
 
         await protocol.send(
             sender="planner", recipients=["coder", "runner", "critic"], content="multi-recipient"
         )
 
-        assert router.route.call_count == 3
-        messages = [router.route.call_args_list[i][0][0] for i in range(3)]
+        assert len(router.calls) == 3
+        messages = router.calls[:3]
 
         # All messages from this send should have the same epoch
         epochs = {msg.topo_epoch for msg in messages}
@@ -1,31 +1,26 @@
 """Tests for A2A ingress chain topology enforcement and msg_id uniqueness."""
 
-from unittest.mock import AsyncMock, MagicMock
-
 import pytest
+from stubs import StubRouter, StubSwitch
+from test_helpers import assert_msg_id_shape
 
 from apex.a2a import A2ACompliance
-from apex.runtime.router import Router
-from apex.runtime.switch import SwitchEngine
+from apex.runtime.message import next_msg_id
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def router():
-    """Create mock router."""
-    router = AsyncMock(spec=Router)
-    router.route = AsyncMock()
-    return router
+    """Create recording router stub."""
+    return StubRouter()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def switch():
-    """Create mock switch."""
-    switch = MagicMock(spec=SwitchEngine)
-    switch.active = MagicMock(return_value=("chain", 1))
-    return switch
+    """Create switch stub."""
+    return StubSwitch("chain", 1)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def compliance(router, switch):
     """Create A2A compliance instance."""
     return A2ACompliance(
@@ -35,6 +30,13 @@ def compliance(router, switch):
     )
 
 
+@pytest.fixture(autouse=True)
+def _reset(router, switch):
+    """Return the module-scoped stubs to their initial state before each test."""
+    router.reset()
+    switch.state = ("chain", 1)
+
+
 class TestIngressChainEnforcement:
     """Test chain topology enforcement for external ingress."""
 
@@ -53,34 +55,6 @@ class TestIngressChainEnforcement:
         assert messages[0].sender == "external"
         assert messages[0].recipient == "planner"
 
-    def test_external_to_runner_rejected(self, compliance):
-        """Test external sender cannot send directly to runner in chain."""
-        request = {
-            "sender": "external",
-            "recipient": "runner",
-            "content": "Skip to runner",
-            "metadata": {"topology": "chain"},
-        }
-
-        with pytest.raises(ValueError) as exc_info:
-            compliance.from_a2a_request(request)
-
-        assert "External chain ingress must route through planner" in str(exc_info.value)
-
-    def test_external_to_critic_rejected(self, compliance):
-        """Test external sender cannot skip to critic in chain."""
-        request = {
-            "sender": "unknown_external",
-            "recipient": "critic",
-            "content": "Jump to critic",
-            "metadata": {"topology": "chain"},
-        }
-
-        with pytest.raises(ValueError) as exc_info:
-            compliance.from_a2a_request(request)
-
-        assert "External chain ingress must route through planner" in str(exc_info.value)
-
     def test_internal_next_hop_enforced(self, compliance):
         """Test internal senders must follow chain next-hop."""
         # Valid: planner -> coder
@@ -101,20 +75,31 @@ class TestIngressChainEnforcement:
         assert "Chain topology violation" in str(exc_info.value)
         assert "planner must send to coder" in str(exc_info.value)
 
-    def test_internal_backward_hop_rejected(self, compliance):
-        """Test chain cannot go backward."""
+    @pytest.mark.parametrize(
+        "sender,recipient,expected",
+        [
+            # External sender cannot send directly to runner
+            ("external", "runner", "External chain ingress must route through planner"),
+            # External sender cannot skip to critic
+            ("unknown_external", "critic", "External chain ingress must route through planner"),
+            # Chain cannot go backward
+            ("runner", "coder", "Chain topology violation: runner must send to critic"),
+        ],
+        ids=["external_to_runner", "external_to_critic", "internal_backward_hop"],
+    )
+    def test_chain_ingress_rejected(self, compliance, sender, recipient, expected):
+        """Test chain ingress rejects hops that bypass planner or the next-hop rule."""
         request = {
-            "sender": "runner",
-            "recipient": "coder",  # Backward!
-            "content": "Go back",
+            "sender": sender,
+            "recipient": recipient,
+            "content": "Out of order",
             "metadata": {"topology": "chain"},
         }
 
         with pytest.raises(ValueError) as exc_info:
             compliance.from_a2a_request(request)
 
-        assert "Chain topology violation" in str(exc_info.value)
-        assert "runner must send to critic" in str(exc_info.value)
+        assert expected in str(exc_info.value)
 
 
 class TestIngressMessageIdUniqueness:
@@ -122,7 +107,7 @@ class TestIngressMessageIdUniqueness:
 
     def test_flat_fanout_unique_msg_ids(self, compliance, router, switch):
         """Test flat topology fanout creates unique msg_id per recipient."""
-        switch.active.return_value = ("flat", 1)
+        switch.state = ("flat", 1)
 
         request = {
             "id": "external-123",  # External request ID
@@ -145,44 +130,35 @@ class TestIngressMessageIdUniqueness:
 
     def test_multiple_requests_unique_msg_ids(self, compliance):
         """Test multiple identical requests get unique internal msg_ids."""
-        msg_ids = set()
-
-        # Send same request 100 times
-        for _ in range(100):
-            request = {
-                "id": "same-external-id",
-                "sender": "external",
-                "recipient": "planner",
-                "content": "Identical content",
-                "metadata": {"topology": "star"},
-            }
-
-            messages = compliance.from_a2a_request(request)
-            msg_ids.add(messages[0].msg_id)
-
-        # All internal IDs must be unique
-        assert len(msg_ids) == 100, f"Duplicates found! Only {len(msg_ids)} unique out of 100"
-
-    def test_msg_id_format_is_uuid(self, compliance):
-        """Test msg_id uses UUID hex format."""
         request = {
+            "id": "same-external-id",
             "sender": "external",
             "recipient": "planner",
-            "content": "Test",
+            "content": "Identical content",
             "metadata": {"topology": "star"},
         }
 
-        messages = compliance.from_a2a_request(request)
-        msg_id = messages[0].msg_id
+        # A few identical requests end to end; the generator is checked below
+        msg_ids = {compliance.from_a2a_request(request)[0].msg_id for _ in range(10)}
+        assert len(msg_ids) == 10, f"Duplicates found! Only {len(msg_ids)} unique out of 10"
 
-        # Format: msg-<uuid_hex>
-        assert msg_id.startswith("msg-")
-        hex_part = msg_id[4:]  # Remove "msg-" prefix
+    def test_msg_id_generator_unique(self):
+        """Test the ingress msg_id generator directly, without request handling."""
+        ids = {next_msg_id() for _ in range(1000)}
+        assert len(ids) == 1000
 
-        # UUID hex is 32 characters
-        assert len(hex_part) == 32
-        # All characters should be valid hex
-        assert all(c in "0123456789abcdef" for c in hex_part)
+    def test_msg_id_format_is_prefix_and_counter_hex(self, compliance):
+        """Test msg_id is msg- followed by 32 lowercase hex chars."""
+        request = {
+            "sender": "external",
+            "recipient": "planner",
+            "content": "Test",
+            "metadata": {"topology": "star"},
+        }
+
+        messages = compliance.from_a2a_request(request)
+        # Format: msg-<process prefix><counter>
+        assert_msg_id_shape(messages[0].msg_id)
 
     def test_external_id_preserved_in_payload(self, compliance):
         """Test external request ID is preserved in payload."""
@@ -199,9 +175,8 @@ class TestIngressMessageIdUniqueness:
         assert len(messages) == 1
         msg = messages[0]
 
-        # Internal msg_id should be UUID
-        assert msg.msg_id.startswith("msg-")
-        assert len(msg.msg_id) > 20  # UUID hex
+        # Internal msg_id comes from next_msg_id()
+        assert_msg_id_shape(msg.msg_id)
 
         # External ID preserved in payload
         assert msg.payload["ext_request_id"] == "ext-request-456"
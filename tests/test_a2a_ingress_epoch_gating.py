@@ -5,31 +5,23 @@ import os
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from stubs import StubRouter, StubSwitch
 
 from apex.a2a import A2ACompliance
 from apex.runtime.message import Message
-from apex.runtime.router import Router
-from apex.runtime.switch import SwitchEngine
 
 
 @pytest.fixture
 def router():
-    """Create mock router with queues."""
-    router = AsyncMock(spec=Router)
-    router._queues = {"active": {}, "next": {}}
-    router.route = AsyncMock()
-    router.enqueue = AsyncMock()
-    router.dequeue = AsyncMock(return_value=None)
-    return router
+    """Create recording router stub."""
+    return StubRouter()
 
 
 @pytest.fixture
-def switch(router):
-    """Create mock switch with state management."""
-    switch = MagicMock(spec=SwitchEngine)
-    switch.active = MagicMock(return_value=("star", 1))
-    switch._in_switch = False  # Track switch state
-    switch.router = router
+def switch():
+    """Create switch stub; _in_switch tracks whether a switch is in progress."""
+    switch = StubSwitch("star", 1)
+    switch._in_switch = False
     return switch
 
 
@@ -104,8 +96,8 @@ class TestA2AIngressServer:
         response = await compliance._handle_ingress_send(request)
 
         # Verify Router.route was called
-        assert router.route.called
-        msg = router.route.call_args[0][0]
+        assert router.calls
+        msg = router.calls[-1]
         assert isinstance(msg, Message)
         assert msg.sender == "external"
         assert msg.recipient == "planner"
@@ -119,12 +111,11 @@ class TestA2AIngressServer:
 class TestEpochGatingViaIngress:
     """Test epoch gating is enforced for A2A ingress during switch."""
 
-    @pytest.mark.asyncio
-    async def test_ingress_during_quiesce_routes_to_next(self, compliance, router, switch):
+    def test_ingress_during_quiesce_routes_to_next(self, compliance, switch):
         """Test messages during QUIESCE go to next epoch queue."""
         # Set switch to be in switch operation (epoch 2 is next)
         switch._in_switch = True
-        switch.active = MagicMock(return_value=("star", 2))  # Return next epoch during switch
+        switch.state = ("star", 2)  # Return next epoch during switch
 
         # Send via ingress during QUIESCE
         request = {
@@ -150,7 +141,7 @@ class TestEpochGatingViaIngress:
         """Test no N+1 dequeue while N is active (abort path)."""
         # Setup: epoch N=1 active, switch to N+1=2 expected to abort
         switch._in_switch = True  # In switch operation
-        switch.active = MagicMock(return_value=("star", 2))  # Next epoch during switch
+        switch.state = ("star", 2)  # Next epoch during switch
 
         # Queue tracking
         active_queue = []
@@ -182,7 +173,7 @@ class TestEpochGatingViaIngress:
 
         # Simulate ABORT - active stays at 1
         switch._in_switch = False  # Switch aborted
-        switch.active = MagicMock(return_value=("star", 1))  # Back to epoch 1
+        switch.state = ("star", 1)  # Back to epoch 1
         await asyncio.sleep(0)  # Let async operations complete
 
         # Now message can be dequeued from active queue
@@ -1,34 +1,25 @@
 """Tests proving ingress uses runtime topology from switch, not metadata."""
 
-from unittest.mock import AsyncMock, MagicMock
-
 import pytest
+from stubs import StubRouter, StubSwitch
 
 from apex.a2a import A2ACompliance
-from apex.runtime.router import Router
-from apex.runtime.switch import SwitchEngine
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def router():
-    """Create mock router."""
-    router = AsyncMock(spec=Router)
-    router.route = AsyncMock()
-    return router
+    """Create recording router stub."""
+    return StubRouter()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def switch():
-    """Create mock switch with mutable state."""
-    switch = MagicMock(spec=SwitchEngine)
+    """Create switch stub with mutable state."""
     # Start with star topology
-    switch._topology = "star"
-    switch._epoch = 1
-    switch.active = MagicMock(side_effect=lambda: (switch._topology, switch._epoch))
-    return switch
+    return StubSwitch("star", 1)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def compliance(router, switch):
     """Create A2A compliance instance."""
     return A2ACompliance(
@@ -36,6 +27,13 @@ def compliance(router, switch):
     )
 
 
+@pytest.fixture(autouse=True)
+def _reset(router, switch):
+    """Return the module-scoped stubs to their initial state before each test."""
+    router.reset()
+    switch.state = ("star", 1)
+
+
 class TestIngressTopologyEnforcement:
     """Test that ingress enforces runtime topology, not metadata claims."""
 
@@ -73,8 +71,7 @@ class TestIngressTopologyEnforcement:
     async def test_ingress_switches_with_runtime_not_metadata(self, compliance, router, switch):
         """Test ingress follows runtime topology switches, ignoring metadata."""
         # Start in CHAIN topology
-        switch._topology = "chain"
-        switch._epoch = 2
+        switch.state = ("chain", 2)
 
         # Request claims STAR topology (wrong!)
         request = {
@@ -101,8 +98,7 @@ class TestIngressTopologyEnforcement:
     async def test_ingress_flat_enforced_despite_metadata(self, compliance, router, switch):
         """Test flat topology enforced even if metadata claims otherwise."""
         # Runtime is FLAT topology
-        switch._topology = "flat"
-        switch._epoch = 3
+        switch.state = ("flat", 3)
 
         # Request claims STAR topology and uses single recipient (wrong for flat!)
         request = {
@@ -147,8 +143,7 @@ class TestIngressTopologyEnforcement:
     @pytest.mark.asyncio
     async def test_metadata_topology_preserved_as_claimed_not_enforced(self, compliance, switch):
         """Test metadata["topology"] is preserved as claimed_topology but not used."""
-        switch._topology = "star"
-        switch._epoch = 1
+        switch.state = ("star", 1)
 
         request = {
             "method": "send",
@@ -172,66 +167,51 @@ class TestIngressTopologyEnforcement:
         assert len(msg.msg_id) == 36  # msg- + 32 hex chars
 
     @pytest.mark.asyncio
-    async def test_rapid_topology_switches_ignored_in_metadata(self, compliance, switch):
+    @pytest.mark.parametrize(
+        "state,params,expected_recipients",
+        [
+            # Claims chain but runtime is star: star enforced
+            (
+                ("star", 1),
+                {"sender": "coder", "recipient": "runner", "metadata": {"topology": "chain"}},
+                ["planner"],
+            ),
+            # Claims flat but runtime is chain
+            (
+                ("chain", 2),
+                {"sender": "external", "recipient": "planner", "metadata": {"topology": "flat"}},
+                ["planner"],
+            ),
+            # Claims star but runtime is flat: flat creates multiple messages
+            (
+                ("flat", 3),
+                {
+                    "sender": "planner",
+                    "recipients": ["coder", "runner"],
+                    "metadata": {"topology": "star"},
+                },
+                ["coder", "runner"],
+            ),
+        ],
+        ids=["star", "chain", "flat"],
+    )
+    async def test_rapid_topology_switches_ignored_in_metadata(
+        self, compliance, switch, state, params, expected_recipients
+    ):
         """Test rapid runtime switches are enforced, metadata ignored."""
-        # Test star topology enforcement
-        switch._topology = "star"
-        switch._epoch = 1
-
-        request = {
-            "method": "send",
-            "params": {
-                "sender": "coder",
-                "recipient": "runner",
-                "content": "star test",
-                "metadata": {"topology": "chain"},  # Claims chain but runtime is star
-            },
-        }
-        messages = compliance.from_a2a_request(request)
-        assert messages[0].recipient == "planner"  # Star enforced
-        assert messages[0].topo_epoch == 1
-
-        # Test chain topology enforcement
-        switch._topology = "chain"
-        switch._epoch = 2
+        switch.state = state
+        params = dict(params, content=f"{state[0]} test")
 
-        request = {
-            "method": "send",
-            "params": {
-                "sender": "external",
-                "recipient": "planner",
-                "content": "chain test",
-                "metadata": {"topology": "flat"},  # Claims flat but runtime is chain
-            },
-        }
-        messages = compliance.from_a2a_request(request)
-        assert messages[0].recipient == "planner"
-        assert messages[0].topo_epoch == 2
-
-        # Test flat topology enforcement
-        switch._topology = "flat"
-        switch._epoch = 3
+        messages = compliance.from_a2a_request({"method": "send", "params": params})
 
-        request = {
-            "method": "send",
-            "params": {
-                "sender": "planner",
-                "recipients": ["coder", "runner"],
-                "content": "flat test",
-                "metadata": {"topology": "star"},  # Claims star but runtime is flat
-            },
-        }
-        messages = compliance.from_a2a_request(request)
-        assert len(messages) == 2  # Flat creates multiple messages
-        assert {msg.recipient for msg in messages} == {"coder", "runner"}
-        assert all(msg.topo_epoch == 3 for msg in messages)
+        assert sorted(msg.recipient for msg in messages) == expected_recipients
+        assert all(msg.topo_epoch == state[1] for msg in messages)
 
     @pytest.mark.asyncio
     async def test_external_chain_ingress_ignores_metadata(self, compliance, switch):
         """Test external chain ingress enforcement ignores metadata claims."""
         # Runtime is chain
-        switch._topology = "chain"
-        switch._epoch = 5
+        switch.state = ("chain", 5)
 
         # External tries to bypass planner entry, claims star topology
         request = {
@@ -1,14 +1,23 @@
-"""Tests for A2A SDK optional imports and functionality."""
+"""Tests for A2A SDK optional imports and functionality.
+
+Module-level SDK flags are patched through monkeypatch only, so tests here
+leave no global state behind and are safe to run under pytest-xdist.
+"""
 
 import importlib.util
+import sys
 
 import pytest
+from stubs import StubRouter, StubSwitch
+
+
+def _has(name: str) -> bool:
+    """Return whether a module is importable, skipping the finder if already imported."""
+    return name in sys.modules or importlib.util.find_spec(name) is not None
 
-HAS_A2A = (
-    importlib.util.find_spec("a2a") is not None
-    or importlib.util.find_spec("python_a2a") is not None
-)
-HAS_UVICORN = importlib.util.find_spec("uvicorn") is not None
+
+HAS_A2A = _has("a2a") or _has("python_a2a")
+HAS_UVICORN = _has("uvicorn")
 
 
 @pytest.mark.skipif(not HAS_A2A, reason="A2A SDK not installed")
@@ -45,19 +54,11 @@ class TestA2ASDKImports:
 
     def test_agent_card_with_sdk(self):
         """Test agent card generation works with SDK."""
-        from unittest.mock import MagicMock
-
         from apex.a2a import A2ACompliance
-        from apex.runtime.router import Router
-        from apex.runtime.switch import SwitchEngine
-
-        router = MagicMock(spec=Router)
-        switch = MagicMock(spec=SwitchEngine)
-        switch.active = MagicMock(return_value=("star", 1))
 
         compliance = A2ACompliance(
-            router=router,
-            switch=switch,
+            router=StubRouter(),
+            switch=StubSwitch("star", 1),
             roles=["planner", "coder", "runner", "critic"],
         )
 
@@ -90,81 +91,55 @@ class TestA2AHTTPIngress:
         assert hasattr(uvicorn, "Server")
 
     @pytest.mark.asyncio
-    async def test_ingress_start_with_sdk(self):
+    async def test_ingress_start_with_sdk(self, monkeypatch):
         """Test ingress server can be started when SDK is available."""
-        import os
-        from unittest.mock import AsyncMock, MagicMock, patch
-
-        # Mock the SDK availability check
-        with patch("apex.a2a.sdk_adapter.HAS_A2A_HTTP", True):
-            with patch("apex.a2a.sdk_adapter.create_ingress_app") as mock_create_app:
-                mock_create_app.return_value = MagicMock()  # Mock app
+        from apex.a2a import A2AProtocol
 
-                from apex.a2a import A2AProtocol
-                from apex.runtime.router import Router
-                from apex.runtime.switch import SwitchEngine
+        servers = []
 
-                router = AsyncMock(spec=Router)
-                switch = MagicMock(spec=SwitchEngine)
-                switch.active = MagicMock(return_value=("star", 1))
+        class _Server:
+            def __init__(self, config):
+                servers.append(config)
 
-                protocol = A2AProtocol(router, switch)
+            async def serve(self):
+                pass
 
-                # Enable ingress via env
-                os.environ["APEX_A2A_INGRESS"] = "1"
+        # Pretend the SDK HTTP extras are present and keep uvicorn from binding a port
+        monkeypatch.setattr("apex.a2a.sdk_adapter.HAS_A2A_HTTP", True)
+        monkeypatch.setattr("apex.a2a.sdk_adapter.create_ingress_app", lambda **kwargs: object())
+        monkeypatch.setattr("uvicorn.Server", _Server)
+        monkeypatch.setenv("APEX_A2A_INGRESS", "1")
 
-                # Mock uvicorn to avoid actual server start
-                with patch("uvicorn.Server") as mock_server_class:
-                    mock_server = AsyncMock()
-                    mock_server_class.return_value = mock_server
-                    mock_server.serve = AsyncMock()
+        protocol = A2AProtocol(StubRouter(), StubSwitch("star", 1))
 
-                    # This should not raise if SDK is properly installed
-                    await protocol.start_ingress(port=10001)
+        # This should not raise if SDK is properly installed
+        await protocol.start_ingress(port=10001)
 
-                    # Verify server was configured
-                    mock_server_class.assert_called_once()
-
-                # Cleanup
-                os.environ.pop("APEX_A2A_INGRESS", None)
+        # Verify server was configured
+        assert len(servers) == 1
 
 
 @pytest.mark.skipif(HAS_A2A, reason="Testing fallback when SDK not installed")
 class TestA2AFallback:
     """Test A2A functionality falls back gracefully without SDK."""
 
-    def test_compliance_fallback_without_sdk(self):
+    def test_compliance_fallback_without_sdk(self, monkeypatch):
         """Test A2ACompliance works without SDK using dict fallback."""
-        from unittest.mock import MagicMock
-
-        # Force reload without SDK
         import apex.a2a.sdk_adapter as sdk_adapter
-        from apex.runtime.router import Router
-        from apex.runtime.switch import SwitchEngine
 
-        # Temporarily force HAS_A2A_SDK to False to test fallback
-        original_has_sdk = sdk_adapter.HAS_A2A_SDK
-        sdk_adapter.HAS_A2A_SDK = False
+        # Force the fallback path; monkeypatch restores the flag after the test
+        monkeypatch.setattr(sdk_adapter, "HAS_A2A_SDK", False)
 
-        try:
-            router = MagicMock(spec=Router)
-            switch = MagicMock(spec=SwitchEngine)
-            switch.active = MagicMock(return_value=("star", 1))
-
-            compliance = sdk_adapter.A2ACompliance(
-                router=router,
-                switch=switch,
-                roles=["planner", "coder", "runner", "critic"],
-            )
-
-            card = compliance.agent_card()
-
-            # Should return a fallback dict
-            assert isinstance(card, dict)
-            assert card["name"] == "apex-framework"
-            assert "capabilities" in card
-            assert card["capabilities"]["roles"] == ["planner", "coder", "runner", "critic"]
-
-        finally:
-            # Restore original value
-            sdk_adapter.HAS_A2A_SDK = original_has_sdk
+        compliance = sdk_adapter.A2ACompliance(
+            router=StubRouter(),
+            switch=StubSwitch("star", 1),
+            roles=["planner", "coder", "runner", "critic"],
+        )
+
+        card = compliance.agent_card()
+
+        # Should return a fallback dict
+        assert isinstance(card, dict)
+        assert card["name"] == "apex-framework"
+        assert "capabilities" in card
+        assert card["capabilities"]["roles"] == ["planner", "coder", "runner", "critic"]
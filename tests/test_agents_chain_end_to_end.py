@@ -7,15 +7,25 @@ from uuid import uuid4
 import pytest
 from test_helpers import (
     TraceCollector,
-    TracingRouter,
     create_agents,
+    create_tracing_stack,
 )
 
 from apex.agents.episode import EpisodeRunner
-from apex.runtime.message import AgentID, Epoch, Message
-from apex.runtime.router import Router
-from apex.runtime.switch import SwitchEngine
-from apex.runtime.topology_guard import TopologyGuard, TopologyViolationError
+from apex.runtime.message import AgentID, Epoch, Message, next_msg_id
+from apex.runtime.topology_guard import TopologyViolationError
+
+# Allowed hops for either chain order: P→C→R→Cr→S→P or P→C→R→Cr→P
+_VALID_CHAIN_EDGES = frozenset(
+    {
+        ("planner", "coder"),
+        ("coder", "runner"),
+        ("runner", "critic"),
+        ("critic", "summarizer"),
+        ("summarizer", "planner"),
+        ("critic", "planner"),
+    }
+)
 
 
 class TracingEpisodeRunner(EpisodeRunner):
@@ -37,7 +47,7 @@ class TracingEpisodeRunner(EpisodeRunner):
         _, epoch = self.switch.active()
         kickoff = Message(
             episode_id=self.episode_id,
-            msg_id=uuid4().hex,
+            msg_id=next_msg_id(),
             sender=AgentID("system"),
             recipient=AgentID("planner"),
             topo_epoch=epoch,
@@ -103,24 +113,8 @@ async def test_chain_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm)
     """Test chain topology with all agents."""
     trace = TraceCollector()
 
-    # Create router with topology guard
-    recipients = ["planner", "coder", "runner", "critic", "summarizer"]
-    topology_guard = TopologyGuard()
-
-    # Create switch engine
-    base_router = Router(recipients=recipients)
-    switch = SwitchEngine(base_router)
-
-    # Create tracing router with switch and guard
-    router = TracingRouter(
-        recipients=recipients,
-        trace_collector=trace,
-        switch_engine=switch,
-        topology_guard=topology_guard,
-    )
-
-    # Update switch to use tracing router
-    switch._router = router
+    # Tracing router and switch engine, wired to each other
+    router, switch = create_tracing_stack(trace)
 
     # Set topology to chain
     await switch.switch_to("chain")
@@ -144,34 +138,16 @@ async def test_chain_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm)
     assert result["steps_taken"] <= 20, "Should complete in <= 20 steps"
 
     # Verify chain topology rules from trace
-    # Expected chain order: P→C→R→Cr→S→P
-    valid_edges_with_summarizer = {
-        ("planner", "coder"),
-        ("coder", "runner"),
-        ("runner", "critic"),
-        ("critic", "summarizer"),
-        ("summarizer", "planner"),
-    }
-
-    valid_edges_without_summarizer = {
-        ("planner", "coder"),
-        ("coder", "runner"),
-        ("runner", "critic"),
-        ("critic", "planner"),
-    }
-
     # Collect all message edges from trace
     message_edges = set()
     for event in trace.events:
-        if event["event"] == "enqueue" and event["from_agent"] != "system":
+        if event["event"] == "enqueue_success" and event["from_agent"] != "system":
             edge = (event["from_agent"], event["to_agent"])
             message_edges.add(edge)
 
     # Check that all edges are valid
     for edge in message_edges:
-        assert (
-            edge in valid_edges_with_summarizer or edge in valid_edges_without_summarizer
-        ), f"Invalid chain edge: {edge[0]} → {edge[1]}"
+        assert edge in _VALID_CHAIN_EDGES, f"Invalid chain edge: {edge[0]} → {edge[1]}"
 
     print(f"Chain edges found: {message_edges}")
 
@@ -179,7 +155,7 @@ async def test_chain_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm)
     with pytest.raises(TopologyViolationError):
         illegal_msg = Message(
             episode_id="test",
-            msg_id=uuid4().hex,
+            msg_id=next_msg_id(),
             sender=AgentID("coder"),
             recipient=AgentID("critic"),  # Illegal: skips runner
             topo_epoch=Epoch(1),
@@ -6,18 +6,25 @@ from typing import List
 from uuid import uuid4
 
 import pytest
+import pytest_asyncio
 from test_helpers import (
     TraceCollector,
-    TracingRouter,
     create_agents,
+    create_tracing_stack,
 )
 
 from apex.agents.base import BaseAgent
 from apex.agents.episode import EpisodeRunner
-from apex.runtime.message import AgentID, Epoch, Message
-from apex.runtime.router import Router
-from apex.runtime.switch import SwitchEngine
-from apex.runtime.topology_guard import TopologyGuard, TopologyViolationError
+from apex.runtime.message import AgentID, Epoch, Message, next_msg_id
+from apex.runtime.topology_guard import TopologyViolationError
+
+# In flat topology, all peer-to-peer messages are allowed
+_P2P_PAIRS = [
+    ("coder", "runner"),
+    ("runner", "critic"),
+    ("critic", "coder"),
+    ("planner", "summarizer"),
+]
 
 
 class TracingEpisodeRunner(EpisodeRunner):
@@ -39,7 +46,7 @@ class TracingEpisodeRunner(EpisodeRunner):
         _, epoch = self.switch.active()
         kickoff = Message(
             episode_id=self.episode_id,
-            msg_id=uuid4().hex,
+            msg_id=next_msg_id(),
             sender=AgentID("system"),
             recipient=AgentID("planner"),
             topo_epoch=epoch,
@@ -118,24 +125,8 @@ async def test_flat_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm):
     """Test flat topology with all agents."""
     trace = TraceCollector()
 
-    # Create router with topology guard (fanout limit = 2)
-    recipients = ["planner", "coder", "runner", "critic", "summarizer"]
-    topology_guard = TopologyGuard(fanout_limit=2)
-
-    # Create switch engine
-    base_router = Router(recipients=recipients)
-    switch = SwitchEngine(base_router)
-
-    # Create tracing router with switch and guard
-    router = TracingRouter(
-        recipients=recipients,
-        trace_collector=trace,
-        switch_engine=switch,
-        topology_guard=topology_guard,
-    )
-
-    # Update switch to use tracing router
-    switch._router = router
+    # Tracing router and switch engine, wired to each other
+    router, switch = create_tracing_stack(trace, fanout_limit=2)
 
     # Set topology to flat
     await switch.switch_to("flat")
@@ -158,28 +149,6 @@ async def test_flat_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm):
     assert result["success"], "Episode should succeed with tests passing"
     assert result["steps_taken"] <= 20, "Should complete in <= 20 steps"
 
-    # In flat topology, all peer-to-peer messages are allowed
-    # Verify that various P2P messages work
-    test_pairs = [
-        ("coder", "runner"),
-        ("runner", "critic"),
-        ("critic", "coder"),
-        ("planner", "summarizer"),
-    ]
-
-    for sender, recipient in test_pairs:
-        test_msg = Message(
-            episode_id="test",
-            msg_id=uuid4().hex,
-            sender=AgentID(sender),
-            recipient=AgentID(recipient),
-            topo_epoch=Epoch(1),
-            payload={"test": "p2p"},
-            created_ts=time.monotonic(),
-        )
-        # Should not raise in flat topology
-        await router.route(test_msg)
-
     # Test fanout limit enforcement
     # Create a multicast agent that tries to send to >2 recipients
     multicast_agent = MulticastAgent(
@@ -195,7 +164,7 @@ async def test_flat_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm):
     # Try to send messages exceeding fanout
     test_msg = Message(
         episode_id="test",
-        msg_id=uuid4().hex,
+        msg_id=next_msg_id(),
         sender=AgentID("planner"),
         recipient=AgentID("multicast_test"),
         topo_epoch=Epoch(1),
@@ -221,7 +190,7 @@ async def test_flat_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm):
     # Let's test BROADCAST fanout
     broadcast_msg = Message(
         episode_id="test",
-        msg_id=uuid4().hex,
+        msg_id=next_msg_id(),
         sender=AgentID("planner"),
         recipient="BROADCAST",
         topo_epoch=Epoch(1),
@@ -241,3 +210,29 @@ async def test_flat_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm):
     print(f"Episode completed in {result['steps_taken']} steps")
     print(f"Messages routed: {result['messages_routed']}")
     print(f"Messages handled: {result['messages_handled']}")
+
+
+@pytest_asyncio.fixture
+async def flat_router():
+    """Tracing router whose switch has committed to flat topology."""
+    router, switch = create_tracing_stack(TraceCollector(), fanout_limit=2)
+    await switch.switch_to("flat")
+    return router
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sender,recipient", _P2P_PAIRS)
+async def test_flat_allows_peer_to_peer(flat_router, sender, recipient):
+    """Test flat topology routes a direct message between any two agents."""
+    test_msg = Message(
+        episode_id="test",
+        msg_id=next_msg_id(),
+        sender=AgentID(sender),
+        recipient=AgentID(recipient),
+        topo_epoch=Epoch(1),
+        payload={"test": "p2p"},
+        created_ts=time.monotonic(),
+    )
+    # Should be neither rejected by the guard nor dropped by the router
+    assert await flat_router.route(test_msg), test_msg.drop_reason
+    assert flat_router.get_queue_depth(AgentID(recipient)) == 1
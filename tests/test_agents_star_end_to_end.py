@@ -7,15 +7,13 @@ from uuid import uuid4
 import pytest
 from test_helpers import (
     TraceCollector,
-    TracingRouter,
     create_agents,
+    create_tracing_stack,
 )
 
 from apex.agents.episode import EpisodeRunner
-from apex.runtime.message import AgentID, Epoch, Message
-from apex.runtime.router import Router
-from apex.runtime.switch import SwitchEngine
-from apex.runtime.topology_guard import TopologyGuard, TopologyViolationError
+from apex.runtime.message import AgentID, Epoch, Message, next_msg_id
+from apex.runtime.topology_guard import TopologyViolationError
 
 
 class TracingEpisodeRunner(EpisodeRunner):
@@ -37,7 +35,7 @@ class TracingEpisodeRunner(EpisodeRunner):
         _, epoch = self.switch.active()
         kickoff = Message(
             episode_id=self.episode_id,
-            msg_id=uuid4().hex,
+            msg_id=next_msg_id(),
             sender=AgentID("system"),
             recipient=AgentID("planner"),
             topo_epoch=epoch,
@@ -103,24 +101,8 @@ async def test_star_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm):
     """Test star topology with all agents."""
     trace = TraceCollector()
 
-    # Create router with topology guard
-    recipients = ["planner", "coder", "runner", "critic", "summarizer"]
-    topology_guard = TopologyGuard()
-
-    # Create switch engine
-    base_router = Router(recipients=recipients)
-    switch = SwitchEngine(base_router)
-
-    # Create tracing router with switch and guard
-    router = TracingRouter(
-        recipients=recipients,
-        trace_collector=trace,
-        switch_engine=switch,
-        topology_guard=topology_guard,
-    )
-
-    # Update switch to use tracing router
-    switch._router = router
+    # Tracing router and switch engine, wired to each other
+    router, switch = create_tracing_stack(trace)
 
     # Set topology to star
     await switch.switch_to("star")
@@ -148,7 +130,9 @@ async def test_star_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm):
     non_planner_sends = [
         e
         for e in trace.events
-        if e["event"] == "enqueue" and e["from_agent"] != "planner" and e["from_agent"] != "system"
+        if e["event"] == "enqueue_success"
+        and e["from_agent"] != "planner"
+        and e["from_agent"] != "system"
     ]
     for event in non_planner_sends:
         assert (
@@ -159,7 +143,7 @@ async def test_star_topology_end_to_end(toy_repo, stub_fs, stub_test, stub_llm):
     with pytest.raises(TopologyViolationError):
         illegal_msg = Message(
             episode_id="test",
-            msg_id=uuid4().hex,
+            msg_id=next_msg_id(),
             sender=AgentID("coder"),
             recipient=AgentID("runner"),  # Illegal: non-planner to non-planner
             topo_epoch=Epoch(1),
@@ -7,15 +7,14 @@ from uuid import uuid4
 
 import pytest
 from test_helpers import (
+    ROLE_IDS,
     TraceCollector,
-    TracingRouter,
     create_agents,
+    create_tracing_stack,
 )
 
-from apex.runtime.message import AgentID, Message
-from apex.runtime.router import Router
-from apex.runtime.switch import SwitchEngine
-from apex.runtime.topology_guard import TopologyGuard, TopologyViolationError
+from apex.runtime.message import AgentID, Message, next_msg_id
+from apex.runtime.topology_guard import TopologyViolationError
 
 
 @pytest.mark.asyncio
@@ -23,24 +22,8 @@ async def test_switch_mid_episode(toy_repo, stub_fs, stub_test, stub_llm):
     """Test topology switch while episode is running."""
     trace = TraceCollector()
 
-    # Create router with topology guard
-    recipients = ["planner", "coder", "runner", "critic", "summarizer"]
-    topology_guard = TopologyGuard()
-
-    # Create switch engine
-    base_router = Router(recipients=recipients)
-    switch = SwitchEngine(base_router)
-
-    # Create tracing router with switch and guard
-    router = TracingRouter(
-        recipients=recipients,
-        trace_collector=trace,
-        switch_engine=switch,
-        topology_guard=topology_guard,
-    )
-
-    # Update switch to use tracing router
-    switch._router = router
+    # Tracing router and switch engine, wired to each other
+    router, switch = create_tracing_stack(trace)
 
     # Start with star topology
     await switch.switch_to("star")
@@ -57,7 +40,7 @@ async def test_switch_mid_episode(toy_repo, stub_fs, stub_test, stub_llm):
     # Kickoff message
     kickoff = Message(
         episode_id="test-switch",
-        msg_id=uuid4().hex,
+        msg_id=next_msg_id(),
         sender=AgentID("system"),
         recipient=AgentID("planner"),
         topo_epoch=epoch,
@@ -70,7 +53,7 @@ async def test_switch_mid_episode(toy_repo, stub_fs, stub_test, stub_llm):
     for i in range(3):
         msg = Message(
             episode_id="test-switch",
-            msg_id=uuid4().hex,
+            msg_id=next_msg_id(),
             sender=AgentID("coder"),
             recipient=AgentID("planner"),  # Valid in star
             topo_epoch=epoch,
@@ -80,8 +63,7 @@ async def test_switch_mid_episode(toy_repo, stub_fs, stub_test, stub_llm):
         await router.route(msg)
 
     # Check queue state before switch
-    active_before = router.active_counts()
-    total_before = sum(active_before.values())
+    total_before = sum(router.get_queue_depth(AgentID(agent_id)) for agent_id in ROLE_IDS)
     trace.add_event(
         "pre_switch", topology="star", epoch=initial_epoch, queued_messages=total_before
     )
@@ -96,7 +78,7 @@ async def test_switch_mid_episode(toy_repo, stub_fs, stub_test, stub_llm):
     # New messages should go to Q_next during PREPARE/QUIESCE
     new_msg = Message(
         episode_id="test-switch",
-        msg_id=uuid4().hex,
+        msg_id=next_msg_id(),
         sender=AgentID("planner"),
         recipient=AgentID("coder"),  # Valid in chain
         topo_epoch=epoch,
@@ -106,7 +88,7 @@ async def test_switch_mid_episode(toy_repo, stub_fs, stub_test, stub_llm):
     await router.route(new_msg)
 
     # Process some messages to help quiesce
-    for agent_id in recipients:
+    for agent_id in ROLE_IDS:
         msg = await router.dequeue(AgentID(agent_id))
         if msg:
             trace.add_event("dequeue_during_switch", agent=agent_id, msg_epoch=msg.topo_epoch)
@@ -129,7 +111,7 @@ async def test_switch_mid_episode(toy_repo, stub_fs, stub_test, stub_llm):
         with pytest.raises(TopologyViolationError):
             bad_msg = Message(
                 episode_id="test-switch",
-                msg_id=uuid4().hex,
+                msg_id=next_msg_id(),
                 sender=AgentID("coder"),
                 recipient=AgentID("critic"),  # Invalid in chain (skips runner)
                 topo_epoch=new_epoch,
@@ -141,7 +123,7 @@ async def test_switch_mid_episode(toy_repo, stub_fs, stub_test, stub_llm):
         # This should succeed (valid chain order)
         good_msg = Message(
             episode_id="test-switch",
-            msg_id=uuid4().hex,
+            msg_id=next_msg_id(),
             sender=AgentID("coder"),
             recipient=AgentID("runner"),  # Valid in chain
             topo_epoch=new_epoch,
@@ -0,0 +1,33 @@
+"""Tests for the shared evidence-artifact JSONL writer."""
+
+import json
+import os
+
+import pytest
+from artifact_io import write_jsonl
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "writev"), reason="needs os.writev")
+
+_ROWS = [{"step": i, "event": "enqueue"} for i in range(5)]
+
+
+def test_write_jsonl_full_writev(tmp_path):
+    path = tmp_path / "out" / "rows.jsonl"
+    write_jsonl(path, _ROWS)
+
+    assert [json.loads(line) for line in path.read_text().splitlines()] == _ROWS
+
+
+def test_write_jsonl_finishes_short_writev(tmp_path, monkeypatch):
+    """A writev that stops mid-batch is completed with plain writes."""
+    real_writev = os.writev
+
+    def short_writev(fd, bufs):
+        # Write only the first buffer and half of the second
+        return real_writev(fd, [bufs[0], bufs[1][: len(bufs[1]) // 2]])
+
+    monkeypatch.setattr(os, "writev", short_writev)
+    path = tmp_path / "rows.jsonl"
+    write_jsonl(path, _ROWS)
+
+    assert [json.loads(line) for line in path.read_text().splitlines()] == _ROWS
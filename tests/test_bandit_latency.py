@@ -5,6 +5,7 @@ import random
 from pathlib import Path
 
 import numpy as np
+from artifact_io import write_jsonl
 
 from apex.controller.bandit_v1 import BanditSwitchV1
 
@@ -41,12 +42,12 @@ def test_bandit_latency_10k():
         vectors.append(x)
 
     # Run decisions and collect latencies
-    latencies_ms = []
+    latencies_ms = np.empty(len(vectors))
     decisions = []
 
     for i, x in enumerate(vectors):
         decision = bandit.decide(x)
-        latencies_ms.append(decision["ms"])
+        latencies_ms[i] = decision["ms"]
 
         # Store decision for artifact
         decisions.append({"i": i, "ms": decision["ms"]})
@@ -56,19 +57,19 @@ def test_bandit_latency_10k():
             reward = random.gauss(0.1, 0.05)
             bandit.update(x, decision["action"], reward)
 
-    # Compute percentiles
-    latencies_sorted = sorted(latencies_ms)
-    p50_idx = int(0.50 * len(latencies_sorted))
-    p95_idx = int(0.95 * len(latencies_sorted))
+    # Compute percentiles: partial sort puts the p50/p95 order statistics in place
+    p50_idx = int(0.50 * len(latencies_ms))
+    p95_idx = int(0.95 * len(latencies_ms))
+    partitioned = np.partition(latencies_ms, [p50_idx, p95_idx])
 
-    p50 = latencies_sorted[p50_idx]
-    p95 = latencies_sorted[p95_idx]
+    p50 = float(partitioned[p50_idx])
+    p95 = float(partitioned[p95_idx])
 
     print("Latency stats over 10k decisions:")
     print(f"  p50: {p50:.3f} ms")
     print(f"  p95: {p95:.3f} ms")
-    print(f"  min: {min(latencies_ms):.3f} ms")
-    print(f"  max: {max(latencies_ms):.3f} ms")
+    print(f"  min: {latencies_ms.min():.3f} ms")
+    print(f"  max: {latencies_ms.max():.3f} ms")
 
     # Assert p95 < 10ms
     assert p95 < 10.0, f"p95 latency {p95:.3f}ms exceeds 10ms threshold"
@@ -77,20 +78,15 @@ def test_bandit_latency_10k():
     artifact_dir = Path("docs/A4/artifacts")
     artifact_dir.mkdir(parents=True, exist_ok=True)
 
-    with open(artifact_dir / "controller_latency.jsonl", "w") as f:
-        for record in decisions:
-            f.write(json.dumps(record) + "\n")
+    # Written in one pass after the measurement loop, outside the timed path
+    write_jsonl(artifact_dir / "controller_latency.jsonl", decisions)
 
     # Also write histogram bins (optional)
     # Fixed bucket edges: 0-0.1, 0.1-0.5, 0.5-1, 1-5, 5-10, 10+
     bucket_edges = [0, 0.1, 0.5, 1.0, 5.0, 10.0, float("inf")]
-    bucket_counts = [0] * (len(bucket_edges) - 1)
-
-    for ms in latencies_ms:
-        for i in range(len(bucket_edges) - 1):
-            if bucket_edges[i] <= ms < bucket_edges[i + 1]:
-                bucket_counts[i] += 1
-                break
+    # Buckets are half-open [lo, hi): searchsorted(side="right") - 1 is the bucket index
+    bucket_idx = np.searchsorted(bucket_edges, latencies_ms, side="right") - 1
+    bucket_counts = np.bincount(bucket_idx, minlength=len(bucket_edges) - 1).tolist()
 
     histogram = {
         "bucket_edges": bucket_edges[:-1],  # Don't include inf
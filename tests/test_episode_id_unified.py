@@ -10,9 +10,6 @@ from apex.runtime.switch import SwitchEngine
 from apex.runtime.topology_guard import TopologyGuard
 from test_helpers import create_agents
 
-# Import fixtures - these are "unused" but needed by pytest
-from test_helpers import stub_fs, stub_llm, stub_test, toy_repo  # noqa: F401
-
 
 @pytest.mark.asyncio
 async def test_unified_episode_id_all_topologies(
@@ -0,0 +1,77 @@
+"""Test the JSONL line reader's mmap and buffered paths."""
+
+from __future__ import annotations
+
+import mmap
+
+import pytest
+
+from apex.eval import jsonl
+from apex.eval.jsonl import iter_lines
+
+_CASES = {
+    "lf": b'{"a": 1}\n{"a": 2}\n',
+    "crlf": b'{"a": 1}\r\n{"a": 2}\r\n',
+    "no_trailing_newline": b'{"a": 1}\n{"a": 2}',
+    "crlf_no_trailing_newline": b'{"a": 1}\r\n{"a": 2}',
+    "blank_lines": b'{"a": 1}\r\n\r\n\n{"a": 2}\n\n',
+}
+
+
+@pytest.mark.parametrize("data", list(_CASES.values()), ids=list(_CASES))
+def test_mmap_path_matches_buffered_path(monkeypatch, tmp_path, data):
+    """Files above MMAP_THRESHOLD yield exactly what the buffered reader yields."""
+    path = tmp_path / "data.jsonl"
+    path.write_bytes(data)
+    buffered = list(iter_lines(path))
+
+    mapped_calls = []
+    real_mmap = mmap.mmap
+
+    def spy_mmap(*args, **kwargs):
+        mapped_calls.append(args)
+        return real_mmap(*args, **kwargs)
+
+    monkeypatch.setattr(jsonl, "MMAP_THRESHOLD", 1)
+    monkeypatch.setattr(jsonl.mmap, "mmap", spy_mmap)
+    mapped = list(iter_lines(path))
+
+    assert mapped_calls, "mmap branch was not taken"
+    assert mapped == buffered
+    assert [line for _, line in mapped if line] == [b'{"a": 1}', b'{"a": 2}']
+    assert [n for n, _ in mapped] == list(range(1, len(mapped) + 1))
+
+
+def test_small_and_empty_files_use_buffered_path(monkeypatch, tmp_path):
+    """Files below the threshold (including empty ones) never touch mmap."""
+
+    def fail_mmap(*args, **kwargs):
+        raise AssertionError("mmap should not be used below the threshold")
+
+    monkeypatch.setattr(jsonl.mmap, "mmap", fail_mmap)
+    small = tmp_path / "small.jsonl"
+    small.write_bytes(_CASES["crlf_no_trailing_newline"])
+    empty = tmp_path / "empty.jsonl"
+    empty.write_bytes(b"")
+
+    assert list(iter_lines(small)) == [(1, b'{"a": 1}'), (2, b'{"a": 2}')]
+    assert list(iter_lines(empty)) == []
+
+
+def test_zst_files_fall_back_to_stream_reader(monkeypatch, tmp_path):
+    """Compressed files skip mmap even above the threshold."""
+    zstandard = pytest.importorskip("zstandard")
+    data = _CASES["crlf_no_trailing_newline"]
+    plain = tmp_path / "data.jsonl"
+    plain.write_bytes(data)
+    zst = tmp_path / "data.jsonl.zst"
+    zst.write_bytes(zstandard.ZstdCompressor().compress(data))
+
+    def fail_mmap(*args, **kwargs):
+        raise AssertionError("mmap should not be used for .zst files")
+
+    expected = list(iter_lines(plain))
+    monkeypatch.setattr(jsonl, "MMAP_THRESHOLD", 1)
+    monkeypatch.setattr(jsonl.mmap, "mmap", fail_mmap)
+
+    assert list(iter_lines(zst)) == expected
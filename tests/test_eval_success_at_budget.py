@@ -0,0 +1,34 @@
+"""Test the Success@Budget evaluation runner."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+def _run(*args: str) -> None:
+    result = subprocess.run(
+        [sys.executable, "scripts/run_eval_success_at_budget.py", "--episodes", "4", *args],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, f"run_eval_success_at_budget failed: {result.stderr}"
+
+
+def _load(path: Path) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_multi_policy_run_matches_single_policy_runs(tmp_path):
+    """Each policy in --policies must not depend on the policies run before it."""
+    _run("--policies", "static_star,bandit_v1", "--out", str(tmp_path / "multi_{policy}.jsonl"))
+    _run("--policy", "bandit_v1", "--out", str(tmp_path / "single_bandit_v1.jsonl"))
+    _run("--policy", "static_star", "--out", str(tmp_path / "single_static_star.jsonl"))
+
+    for policy in ("static_star", "bandit_v1"):
+        multi = _load(tmp_path / f"multi_{policy}.jsonl")
+        single = _load(tmp_path / f"single_{policy}.jsonl")
+        assert multi == single, f"{policy} results differ between --policies and --policy"
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import pytest
+from artifact_io import write_jsonl
 from stubs import StubFS, StubLLM, StubTest
 
 from apex.agents.base import BaseAgent
@@ -18,52 +17,20 @@ from apex.agents.roles import (
 from apex.runtime.message import AgentID, Message
 from apex.runtime.router import Router
 from apex.runtime.switch import SwitchEngine
+from apex.runtime.topology_guard import TopologyGuard, TopologyViolationError
 
+# Role agents that every end-to-end router is created with
+ROLE_IDS = ["planner", "coder", "runner", "critic", "summarizer"]
 
-@pytest.fixture
-def toy_repo(tmp_path):
-    """Create a toy repository with a bug for testing."""
-    # Create src/app.py with a bug
-    src_dir = tmp_path / "src"
-    src_dir.mkdir()
-    app_file = src_dir / "app.py"
-    app_file.write_text(
-        """def add(a, b):
-    return a - b  # bug; coder should patch to a + b
-"""
-    )
-
-    # Create tests/test_app.py
-    tests_dir = tmp_path / "tests"
-    tests_dir.mkdir()
-    test_file = tests_dir / "test_app.py"
-    test_file.write_text(
-        """from src.app import add
-
-def test_add():
-    assert add(2, 3) == 5
-"""
-    )
-
-    return tmp_path
-
-
-@pytest.fixture
-def stub_fs(toy_repo):
-    """Create a stub filesystem for the toy repo."""
-    return StubFS(toy_repo)
-
+_HEX = frozenset("0123456789abcdef")
 
-@pytest.fixture
-def stub_test(toy_repo):
-    """Create a stub test runner for the toy repo."""
-    return StubTest(toy_repo)
 
-
-@pytest.fixture
-def stub_llm():
-    """Create a stub LLM."""
-    return StubLLM()
+def assert_msg_id_shape(msg_id: str) -> None:
+    """Assert msg_id is ``msg-`` followed by 32 lowercase hex chars."""
+    assert msg_id.startswith("msg-"), f"Invalid prefix in {msg_id}"
+    hex_part = msg_id[4:]
+    assert len(hex_part) == 32, f"Invalid length in {msg_id}: expected 32, got {len(hex_part)}"
+    assert set(hex_part) <= _HEX, f"Non-hex chars in {msg_id}"
 
 
 def create_agents(
@@ -154,73 +121,127 @@ class TraceCollector:
 
     def save_jsonl(self, path: Path):
         """Save events as JSONL to the given path."""
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w") as f:
-            for event in self.events:
-                f.write(json.dumps(event) + "\n")
+        write_jsonl(path, self.events)
 
 
 class TracingRouter(Router):
-    """Router wrapper that traces all events with clear success/rejection status."""
-
-    def __init__(self, *args, trace_collector: TraceCollector, **kwargs):
+    """Router wrapper that traces all events with clear success/rejection status.
+
+    Role agents use lowercase IDs, so topology rules are enforced by the
+    TopologyGuard (raising TopologyViolationError) rather than by the base
+    Router's built-in checks.
+    """
+
+    def __init__(
+        self,
+        *args,
+        trace_collector: TraceCollector,
+        topology_guard: TopologyGuard,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.trace = trace_collector
+        self.topology_guard = topology_guard
+        self.switch_engine: Optional[SwitchEngine] = None
+
+    def _validate_topology(self, msg: Message) -> bool:
+        # Already enforced by the guard in route()
+        return True
+
+    def _active(self) -> Tuple[str, int]:
+        return self.switch_engine.active() if self.switch_engine else ("unknown", 0)
+
+    def _check_topology(self, topology: str, msg: Message) -> None:
+        """Raise TopologyViolationError if msg breaks the active topology."""
+        if msg.recipient == "BROADCAST":
+            self.topology_guard.validate_broadcast(topology, msg.sender, len(ROLE_IDS) - 1)
+        else:
+            self.topology_guard.validate_pair(topology, msg.sender, msg.recipient)
 
     async def route(self, msg: Message) -> bool:
         """Route and trace the message with success/rejection status."""
-        topology, epoch = self._switch_engine.active() if self._switch_engine else ("unknown", 0)
+        topology, epoch = self._active()
 
         # Log attempt
         self.trace.add_event(
             "enqueue_attempt",
             epoch=epoch,
             topology=topology,
-            from_agent=str(msg.sender),
-            to_agent=str(msg.recipient),
+            from_agent=msg.sender,
+            to_agent=msg.recipient,
             msg_id=msg.msg_id,
         )
 
         # Try to route
         try:
+            self._check_topology(topology, msg)
             result = await super().route(msg)
+        except TopologyViolationError as e:
+            # Log rejection
+            self.trace.add_event(
+                "enqueue_rejected",
+                epoch=epoch,
+                topology=topology,
+                from_agent=msg.sender,
+                to_agent=msg.recipient,
+                msg_id=msg.msg_id,
+                reason=str(e),
+            )
+            raise
+
+        if result:
             # Log success
             self.trace.add_event(
                 "enqueue_success",
                 epoch=epoch,
                 topology=topology,
-                from_agent=str(msg.sender),
-                to_agent=str(msg.recipient),
+                from_agent=msg.sender,
+                to_agent=msg.recipient,
                 msg_id=msg.msg_id,
             )
-            return result
-        except Exception as e:
-            # Log rejection
+        else:
+            # Dropped by the router (wrong epoch, queue full)
             self.trace.add_event(
-                "enqueue_rejected",
+                "enqueue_dropped",
                 epoch=epoch,
                 topology=topology,
-                from_agent=str(msg.sender),
-                to_agent=str(msg.recipient),
+                from_agent=msg.sender,
+                to_agent=msg.recipient,
                 msg_id=msg.msg_id,
-                reason=str(e),
+                reason=msg.drop_reason,
             )
-            raise
+        return result
 
     async def dequeue(self, agent_id: AgentID) -> Optional[Message]:
         """Dequeue and trace if a message is returned."""
         msg = await super().dequeue(agent_id)
         if msg:
-            topology, epoch = (
-                self._switch_engine.active() if self._switch_engine else ("unknown", 0)
-            )
+            topology, epoch = self._active()
             self.trace.add_event(
                 "dequeue",
                 epoch=epoch,
                 topology=topology,
-                agent=str(agent_id),
+                agent=agent_id,
                 msg_id=msg.msg_id,
-                from_agent=str(msg.sender),
-                to_agent=str(msg.recipient),
+                from_agent=msg.sender,
+                to_agent=msg.recipient,
             )
         return msg
+
+
+def create_tracing_stack(
+    trace: TraceCollector, fanout_limit: int = 2
+) -> Tuple[TracingRouter, SwitchEngine]:
+    """Create a tracing router and the switch engine that drives it.
+
+    The switch engine owns the router's epochs; the router reads the active
+    (topology, epoch) back from the switch to stamp trace events.
+    """
+    router = TracingRouter(
+        fanout_cap=fanout_limit,
+        trace_collector=trace,
+        topology_guard=TopologyGuard(fanout_limit=fanout_limit),
+    )
+    switch = SwitchEngine(router)
+    router.switch_engine = switch
+    return router, switch
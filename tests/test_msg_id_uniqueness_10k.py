@@ -1,28 +1,22 @@
-"""Test UUID msg_id uniqueness at scale."""
-
-from unittest.mock import AsyncMock, MagicMock
+"""Test next_msg_id() uniqueness at scale ("msg-" plus 32 hex chars)."""
 
 import pytest
+from stubs import StubRouter, StubSwitch
+from test_helpers import assert_msg_id_shape
 
 from apex.a2a import A2ACompliance, A2AProtocol
-from apex.runtime.router import Router
-from apex.runtime.switch import SwitchEngine
 
 
 @pytest.fixture
 def router():
-    """Create mock router."""
-    router = AsyncMock(spec=Router)
-    router.route = AsyncMock()
-    return router
+    """Create recording router stub."""
+    return StubRouter()
 
 
 @pytest.fixture
 def switch():
-    """Create mock switch."""
-    switch = MagicMock(spec=SwitchEngine)
-    switch.active = MagicMock(return_value=("star", 1))
-    return switch
+    """Create switch stub."""
+    return StubSwitch("star", 1)
 
 
 @pytest.fixture
@@ -59,7 +53,7 @@ async def test_10k_messages_unique_ids(protocol, compliance, router, switch):
     ]
 
     for topology, epoch, test_count in test_scenarios:
-        switch.active.return_value = (topology, epoch)
+        switch.state = (topology, epoch)
 
         if topology == "star":
             # Generate star topology messages
@@ -99,7 +93,7 @@ async def test_10k_messages_unique_ids(protocol, compliance, router, switch):
     ]
 
     for topology, epoch, test_count in ingress_scenarios:
-        switch.active.return_value = (topology, epoch)
+        switch.state = (topology, epoch)
 
         if topology == "star":
             for i in range(test_count):
@@ -144,8 +138,7 @@ async def test_10k_messages_unique_ids(protocol, compliance, router, switch):
                     all_msg_ids.append(msg.msg_id)
 
     # Collect all msg_ids from router calls
-    for call in router.route.call_args_list:
-        msg = call[0][0]
+    for msg in router.calls:
         all_msg_ids.append(msg.msg_id)
 
     # Verify uniqueness
@@ -165,10 +158,7 @@ async def test_10k_messages_unique_ids(protocol, compliance, router, switch):
 
     # Verify format: msg-<32 hex chars>
     for msg_id in unique_ids:
-        assert msg_id.startswith("msg-"), f"Invalid prefix in {msg_id}"
-        hex_part = msg_id[4:]
-        assert len(hex_part) == 32, f"Invalid length in {msg_id}: expected 32, got {len(hex_part)}"
-        assert all(c in "0123456789abcdef" for c in hex_part), f"Non-hex chars in {msg_id}"
+        assert_msg_id_shape(msg_id)
 
     # Success message
     print(f"\n✅ SUCCESS: All {len(all_msg_ids)} msg_ids are unique (no collisions)")
@@ -0,0 +1,52 @@
+"""Test the mock SWE evaluation CLI output paths."""
+
+from __future__ import annotations
+
+import json
+import sys
+
+import pytest
+
+from apex.eval import jsonl
+from apex.eval.jsonl import iter_lines
+from scripts import run_swe_mock
+
+
+def _run(monkeypatch, tmp_path, out_name):
+    """Run the CLI on a three-task list and return (exit code, output path)."""
+    task_list = tmp_path / "tasks.jsonl"
+    task_list.write_text(
+        json.dumps({"__meta__": {"n_tasks": 3}})
+        + "\n"
+        + "".join(json.dumps({"task_id": f"t{i}"}) + "\n" for i in range(3))
+    )
+    out = tmp_path / out_name
+    argv = ["run_swe_mock.py", "--policy", "bandit_v1", "--task-list", str(task_list)]
+    monkeypatch.setattr(sys, "argv", argv + ["--out", str(out)])
+    return run_swe_mock.main(), out
+
+
+def test_zst_output_round_trips(monkeypatch, tmp_path):
+    """A .jsonl.zst result file reads back the same records as plain .jsonl."""
+    pytest.importorskip("zstandard")
+
+    plain_code, plain = _run(monkeypatch, tmp_path, "results.jsonl")
+    zst_code, zst = _run(monkeypatch, tmp_path, "results.jsonl.zst")
+
+    assert (plain_code, zst_code) == (0, 0)
+    assert zst.read_bytes()[:4] == b"\x28\xb5\x2f\xfd"  # zstd frame magic
+    records = [json.loads(line) for _, line in iter_lines(zst)]
+    assert records == [json.loads(line) for _, line in iter_lines(plain)]
+    assert records[0]["__meta__"]["n_tasks"] == 3
+    assert [r["task_id"] for r in records[1:]] == ["t0", "t1", "t2"]
+
+
+def test_zst_output_without_zstandard_fails_before_writing(monkeypatch, tmp_path, capsys):
+    """Missing zstandard is reported up front and no output file is created."""
+    monkeypatch.setattr(jsonl, "HAS_ZSTD", False)
+
+    code, out = _run(monkeypatch, tmp_path, "results.jsonl.zst")
+
+    assert code == 1
+    assert not out.exists()
+    assert "zstandard is required" in capsys.readouterr().out
@@ -0,0 +1,209 @@
+"""Test the SWE-bench JSONL result validator."""
+
+from __future__ import annotations
+
+import ast
+import json
+import os
+
+import pytest
+
+from scripts import validate_swe_jsonl
+from scripts.validate_swe_jsonl import validate_jsonl, validate_many, validate_task_list_match
+
+_RECORD = (
+    b'{"task_id": "%s", "policy": "static_star", "success": true, "budget": 10000,'
+    b' "seed": 42, "tokens_used": 100, "over_budget": false}'
+)
+
+
+def test_crlf_file_with_trailing_blank_line(tmp_path):
+    """CRLF line endings and a blank trailing line validate like LF files."""
+    path = tmp_path / "crlf.jsonl"
+    path.write_bytes(_RECORD % b"a" + b"\r\n" + _RECORD % b"b" + b"\r\n\r\n")
+
+    assert validate_jsonl(path) == (True, 2, "Valid JSONL with all required fields")
+
+
+def test_rejects_invalid_json_syntax(tmp_path):
+    """A record with a syntax error is reported with its line number."""
+    path = tmp_path / "syntax.jsonl"
+    path.write_bytes(_RECORD % b"a" + b"\n" + (_RECORD % b"b")[:-1] + b",,}\n")
+
+    valid, line_num, msg = validate_jsonl(path)
+    assert (valid, line_num) == (False, 2)
+    assert msg.startswith("Line 2: JSON decode error")
+
+
+def test_rejects_required_keys_nested_under_meta(tmp_path):
+    """Required keys only count at the top level of a record."""
+    path = tmp_path / "nested.jsonl"
+    path.write_bytes(
+        b'{"meta": {"task_id": "a", "policy": "static_star", "success": true, "budget": 1,'
+        b' "seed": 42, "tokens_used": 1, "over_budget": false}}\n'
+    )
+
+    assert validate_jsonl(path) == (
+        False,
+        1,
+        "Line 1: Missing required field 'task_id'",
+    )
+
+
+def test_task_list_mismatch_reports_missing_and_extra(tmp_path):
+    """A result set that both lacks and adds tasks reports every id of each kind."""
+    task_list = tmp_path / "tasks.jsonl"
+    task_list.write_bytes(b'{"task_id": "a"}\n{"task_id": "b"}\n{"task_id": "c"}\n')
+    results = tmp_path / "results.jsonl"
+    results.write_bytes(b"".join(_RECORD % tid + b"\n" for tid in (b"a", b"x", b"y")))
+
+    valid, msg = validate_task_list_match([results], task_list)
+    assert not valid
+    missing, extra = msg.split("; ")
+    assert missing.startswith("Missing tasks: ") and ast.literal_eval(missing[15:]) == {"b", "c"}
+    assert extra.startswith("Extra tasks: ") and ast.literal_eval(extra[13:]) == {"x", "y"}
+
+
+def test_task_ids_ignore_nested_task_id_keys(tmp_path):
+    """A task_id inside a nested object is not taken as the record's id."""
+    path = tmp_path / "nested.jsonl"
+    path.write_bytes(
+        b'{"x": {"task_id": "a"}}\n'
+        b'{"x": {"task_id": "a"}, "task_id": "b"}\n'
+        b'{"task_id": "c"}\n'
+    )
+
+    assert list(validate_swe_jsonl._iter_task_ids(path, required=False)) == ["b", "c"]
+    with pytest.raises(KeyError):
+        list(validate_swe_jsonl._iter_task_ids(path))
+
+
+def test_task_ids_keep_records_with_nested_meta_key(tmp_path):
+    """Only a top-level __meta__ key marks a metadata line."""
+    path = tmp_path / "meta.jsonl"
+    path.write_bytes(
+        b'{"__meta__": {"task_id": "m"}}\n'
+        b'{"task_id": "a", "extra": {"__meta__": 1}}\n'
+        b'{"extra": {"__meta__": 1}, "task_id": "b"}\n'
+    )
+
+    assert list(validate_swe_jsonl._iter_task_ids(path)) == ["a", "b"]
+
+
+def test_validate_many_reports_each_file_from_the_pool(tmp_path):
+    """Past two files the process pool runs; results keep input order and errors."""
+    paths = []
+    for name, body in [
+        ("one", _RECORD % b"a" + b"\n"),
+        ("two", _RECORD % b"a" + b"\n" + _RECORD % b"b" + b"\n"),
+        ("bad", _RECORD % b"a" + b"\n" + b'{"task_id": "b"}\n'),
+        ("three", b"".join(_RECORD % tid + b"\n" for tid in (b"a", b"b", b"c"))),
+    ]:
+        path = tmp_path / f"{name}.jsonl"
+        path.write_bytes(body)
+        paths.append(path)
+    paths.append(tmp_path / "absent.jsonl")
+
+    assert validate_many(paths) == [
+        (True, 1, "Valid JSONL with all required fields"),
+        (True, 2, "Valid JSONL with all required fields"),
+        (False, 2, "Line 2: Missing required field 'policy'"),
+        (True, 3, "Valid JSONL with all required fields"),
+        (False, 0, f"File not found: {paths[-1]}"),
+    ]
+
+
+def test_task_set_mismatch_between_files_lists_the_difference(tmp_path):
+    """The bitset XOR names ids present in only one of two result files."""
+    task_list = tmp_path / "tasks.jsonl"
+    task_list.write_bytes(
+        b"".join(b'{"task_id": "%s"}\n' % tid for tid in (b"a", b"b", b"c", b"d"))
+    )
+    first = tmp_path / "first.jsonl"
+    first.write_bytes(b"".join(_RECORD % tid + b"\n" for tid in (b"a", b"b", b"c")))
+    second = tmp_path / "second.jsonl"
+    second.write_bytes(b"".join(_RECORD % tid + b"\n" for tid in (b"a", b"c", b"d", b"z")))
+
+    valid, msg = validate_task_list_match([first, second], task_list)
+    assert not valid
+    assert msg.startswith("Task ID mismatch in second.jsonl: ")
+    assert ast.literal_eval(msg.split(": ", 1)[1]) == {"b", "d", "z"}
+
+
+@pytest.fixture
+def cached_run(tmp_path, monkeypatch):
+    """Point the task-id cache at tmp_path and count how often files are parsed."""
+    monkeypatch.setattr(validate_swe_jsonl, "_TASKSET_CACHE", tmp_path / "cache.json")
+    parsed = []
+    iter_task_ids = validate_swe_jsonl._iter_task_ids
+
+    def counting_iter_task_ids(filepath, required=True):
+        parsed.append(filepath.name)
+        return iter_task_ids(filepath, required)
+
+    monkeypatch.setattr(validate_swe_jsonl, "_iter_task_ids", counting_iter_task_ids)
+
+    task_list = tmp_path / "tasks.jsonl"
+    task_list.write_bytes(b'{"task_id": "a"}\n{"task_id": "b"}\n')
+    results = tmp_path / "results.jsonl"
+
+    def write_results(*task_ids: bytes, age_s: int = 60) -> None:
+        results.write_bytes(b"".join(_RECORD % tid + b"\n" for tid in task_ids))
+        mtime = results.stat().st_mtime - age_s
+        os.utime(results, (mtime, mtime))
+
+    def run():
+        parsed.clear()
+        valid, _ = validate_task_list_match([results], task_list, use_cache=True)
+        return valid, parsed.count("results.jsonl")
+
+    return write_results, run, tmp_path / "cache.json"
+
+
+def test_task_id_cache_hit_skips_parsing(cached_run):
+    """An unchanged result file is served from the cache on the second run."""
+    write_results, run, cache_file = cached_run
+    write_results(b"a", b"b")
+
+    assert run() == (True, 1)
+    assert run() == (True, 0)
+    assert json.loads(cache_file.read_text())["version"] == 1
+
+
+def test_task_id_cache_miss_for_recently_modified_file(cached_run):
+    """Files modified within the mtime slack are parsed but not cached."""
+    write_results, run, cache_file = cached_run
+    write_results(b"a", b"b", age_s=0)
+
+    assert run() == (True, 1)
+    assert run() == (True, 1)
+    assert json.loads(cache_file.read_text())["files"] == {}
+
+
+def test_task_id_cache_invalidated_when_file_changes(cached_run):
+    """A rewritten result file is re-parsed and stale ids are not reused."""
+    write_results, run, cache_file = cached_run
+    write_results(b"a", b"b")
+    assert run() == (True, 1)
+
+    write_results(b"a", b"c", age_s=30)
+    assert run() == (False, 1)
+
+
+def test_task_id_cache_evicts_deleted_files(cached_run, tmp_path):
+    """Entries for files that no longer exist are dropped on save."""
+    write_results, run, cache_file = cached_run
+    write_results(b"a", b"b")
+    assert run() == (True, 1)
+
+    other = tmp_path / "other.jsonl"
+    other.write_bytes(_RECORD % b"a" + b"\n" + _RECORD % b"b" + b"\n")
+    os.utime(other, (0, 0))
+    validate_task_list_match([other], tmp_path / "tasks.jsonl", use_cache=True)
+    assert len(json.loads(cache_file.read_text())["files"]) == 2
+
+    other.unlink()
+    assert run() == (True, 0)
+    assert list(json.loads(cache_file.read_text())["files"]) == [
+        str((tmp_path / "results.jsonl").resolve())
+    ]